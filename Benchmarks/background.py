@@ -0,0 +1,104 @@
+"""
+Background pan/zoom benchmark.
+
+Render a sequence of pan and zoom frames of a large background with the
+QGraphicsPixmapItem of the canvas, unfiltered as the canvas draws it and
+smoothly filtered for comparison.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m PuppetMaster.Benchmarks.background
+"""
+import time
+from typing import List
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication, QGraphicsPixmapItem, QGraphicsScene
+from PuppetMaster.Core.PySideLibrary.QtCore import QRectF, Qt
+from PuppetMaster.Core.PySideLibrary.QtGui import QColor, QImage, QLinearGradient, QPainter, QPixmap
+
+IMAGE_WIDTH = 4096
+IMAGE_HEIGHT = 2160
+VIEW_WIDTH = 1280
+VIEW_HEIGHT = 720
+ZOOM_LEVELS = (0.1, 0.25, 0.5, 1.0, 2.0)
+PAN_STEPS = 10
+REPEAT = 15
+
+
+def build_image(width: int = IMAGE_WIDTH, height: int = IMAGE_HEIGHT) -> QImage:
+    """ Build a gradient test image. """
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(20, 40, 80))
+    gradient.setColorAt(1, QColor(200, 120, 40))
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    return image
+
+
+def frames(zoom: float) -> List[QRectF]:
+    """ Get the scene rects of panning across the image at the zoom level. """
+    width = VIEW_WIDTH / zoom
+    height = VIEW_HEIGHT / zoom
+    rects = []
+    for step in range(PAN_STEPS):
+        x = (IMAGE_WIDTH - width) * step / max(1, PAN_STEPS - 1)
+        y = (IMAGE_HEIGHT - height) * step / max(1, PAN_STEPS - 1)
+        rects.append(QRectF(x, y, width, height))
+    return rects
+
+
+def time_frames(scene: QGraphicsScene, rects: List[QRectF], repeat: int = REPEAT) -> float:
+    """
+    Get the average frame time in milliseconds of the fastest of the repeated
+    pans, rendering like the canvas view.
+    """
+    target = QImage(VIEW_WIDTH, VIEW_HEIGHT, QImage.Format_ARGB32_Premultiplied)
+    # warm up caches
+    painter = QPainter(target)
+    scene.render(painter, QRectF(target.rect()), rects[0], Qt.IgnoreAspectRatio)
+    painter.end()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for rect in rects:
+            painter = QPainter(target)
+            painter.setRenderHint(QPainter.Antialiasing)
+            scene.render(painter, QRectF(target.rect()), rect, Qt.IgnoreAspectRatio)
+            painter.end()
+        times.append((time.perf_counter() - start) / len(rects) * 1000)
+    return min(times)
+
+
+def run(zoomLevels=ZOOM_LEVELS) -> List[dict]:
+    """
+    Run the benchmark for each zoom level.
+
+    :param zoomLevels: List of view scales.
+    """
+    image = build_image()
+    pixmapScene = QGraphicsScene()
+    pixmapScene.addItem(QGraphicsPixmapItem(QPixmap.fromImage(image)))
+    smoothScene = QGraphicsScene()
+    smoothNode = QGraphicsPixmapItem(QPixmap.fromImage(image))
+    smoothNode.setTransformationMode(Qt.SmoothTransformation)
+    smoothScene.addItem(smoothNode)
+
+    results = []
+    for zoom in zoomLevels:
+        rects = frames(zoom)
+        results.append({
+            'zoom': zoom,
+            'pixmap_ms': time_frames(pixmapScene, rects),
+            'smooth_ms': time_frames(smoothScene, rects),
+        })
+    return results
+
+
+def main() -> None:
+    QApplication.instance() or QApplication([])
+    print("{:>6} {:>12} {:>12}".format("zoom", "pixmap (ms)", "smooth (ms)"))
+    for result in run():
+        print("{zoom:>6} {pixmap_ms:>12.2f} {smooth_ms:>12.2f}".format(**result))
+
+
+if __name__ == '__main__':
+    main()
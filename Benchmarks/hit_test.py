@@ -0,0 +1,102 @@
+"""
+Picker hit-test benchmark.
+
+Compare the scene index lookup used by CanvasGraphicsView.mouse_on_node against
+the previous linear scan over every item in the scene.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m PuppetMaster.Benchmarks.hit_test
+"""
+import random
+import time
+from typing import List, Optional
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication, QGraphicsItem, QGraphicsScene
+from PuppetMaster.Core.PySideLibrary.QtCore import QPointF, Qt
+
+from PuppetMaster.Core.qnodes import PickNode
+
+NODE_COUNTS = (100, 1000, 5000, 10000)
+# Same as CanvasGraphicsView, mirrored here to avoid importing Maya.
+BSP_TREE_DEPTH = 10
+WORK_WIDTH = 4096
+WORK_HEIGHT = 2160
+
+
+def build_scene(count: int, seed: int = 0) -> QGraphicsScene:
+    """
+    Build a scene of randomly placed PickNodes.
+
+    :param count: Number of PickNodes.
+    :param seed: Seed of the random placement.
+    """
+    rnd = random.Random(seed)
+    scene = QGraphicsScene()
+    scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+    scene.setBspTreeDepth(BSP_TREE_DEPTH)
+    for _ in range(count):
+        node = PickNode()
+        node.setPlainText("Node")
+        node.setFlag(QGraphicsItem.ItemIsSelectable)
+        node.setPos(rnd.uniform(0, WORK_WIDTH), rnd.uniform(0, WORK_HEIGHT))
+        scene.addItem(node)
+    # the BSP index is updated on the next event loop turn
+    QApplication.processEvents()
+    return scene
+
+
+def linear_lookup(scene: QGraphicsScene, position: QPointF) -> Optional[PickNode]:
+    """ Previous mouse_on_node implementation. """
+    for node in scene.items():
+        if isinstance(node, PickNode):
+            if node.mapRectToScene(node.boundingRect()).contains(position):
+                return node
+    return None
+
+
+def indexed_lookup(scene: QGraphicsScene, position: QPointF) -> Optional[PickNode]:
+    """ Current mouse_on_node implementation. """
+    for node in scene.items(position, Qt.IntersectsItemShape, Qt.DescendingOrder):
+        if isinstance(node, PickNode):
+            return node
+    return None
+
+
+def time_lookup(func, scene: QGraphicsScene, points: List[QPointF]) -> float:
+    """
+    Get the average lookup time in microseconds.
+    """
+    start = time.perf_counter()
+    for point in points:
+        func(scene, point)
+    return (time.perf_counter() - start) / len(points) * 1e6
+
+
+def run(counts=NODE_COUNTS, samples: int = 100) -> List[dict]:
+    """
+    Run the benchmark for each node count.
+
+    :param counts: List of node counts.
+    :param samples: Number of cursor positions to look up.
+    """
+    rnd = random.Random(1)
+    results = []
+    for count in counts:
+        scene = build_scene(count)
+        points = [QPointF(rnd.uniform(0, WORK_WIDTH), rnd.uniform(0, WORK_HEIGHT)) for _ in range(samples)]
+        results.append({
+            'nodes': count,
+            'linear_us': time_lookup(linear_lookup, scene, points),
+            'indexed_us': time_lookup(indexed_lookup, scene, points),
+        })
+        scene.clear()
+    return results
+
+
+def main() -> None:
+    QApplication.instance() or QApplication([])
+    print("{:>8} {:>14} {:>14}".format("nodes", "linear (us)", "indexed (us)"))
+    for result in run():
+        print("{nodes:>8} {linear_us:>14.1f} {indexed_us:>14.1f}".format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+In-memory stand-in for the maya and pymel packages, so the UI modules can be
+imported and measured outside Maya. Only the calls PuppetMaster makes are
+implemented, they keep the selection and record every call. The
+SelectionChanged callbacks are called right away by select, as in Maya.
+
+    from PuppetMaster.Benchmarks import mayaStub
+    mayaStub.install()
+"""
+import importlib.util
+import itertools
+import sys
+import types
+from typing import Callable, Dict, List, Tuple
+
+# every stubbed call as (name, args, kwargs), cleared with reset()
+calls: List[tuple] = []
+_selection: List[str] = []
+# callback id: (event, function) of MEventMessage.addEventCallback
+_callbacks: Dict[int, Tuple[str, Callable]] = {}
+_callbackIds = itertools.count(1)
+_installed = False
+
+
+def reset() -> None:
+    """ Clear the recorded calls and the selection. """
+    del calls[:]
+    del _selection[:]
+
+
+def _record(name: str, *args, **kwargs) -> None:
+    calls.append((name, args, kwargs))
+
+
+def _select(*args, **kwargs) -> None:
+    _record("select", *args, **kwargs)
+    if kwargs.get("clear"):
+        del _selection[:]
+    else:
+        objects = list(args[0]) if len(args) == 1 and isinstance(args[0], (list, tuple)) else list(args)
+        if kwargs.get("add"):
+            _selection.extend(name for name in objects if name not in _selection)
+        else:
+            _selection[:] = objects
+    _send("SelectionChanged")
+
+
+def _send(event: str) -> None:
+    for name, func in list(_callbacks.values()):
+        if name == event:
+            func(None)
+
+
+def _ls(*args, **kwargs) -> List[str]:
+    _record("ls", *args, **kwargs)
+    return list(_selection) if kwargs.get("selection") or kwargs.get("sl") else []
+
+
+def _warning(msg: str) -> None:
+    _record("warning", msg)
+
+
+def _error(msg: str) -> None:
+    _record("error", msg)
+    raise RuntimeError(msg)
+
+
+def _about(**kwargs) -> str:
+    return "2025"
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def _build() -> None:
+    cmds = _module("maya.cmds",
+                   select=_select,
+                   ls=_ls,
+                   warning=_warning,
+                   error=_error,
+                   about=_about,
+                   namespace=lambda **kwargs: _record("namespace", **kwargs),
+                   namespaceInfo=lambda **kwargs: [],
+                   undoInfo=lambda **kwargs: _record("undoInfo", **kwargs),
+                   refresh=lambda **kwargs: _record("refresh", **kwargs))
+    mel = _module("maya.mel", eval=lambda cmd: _record("mel", cmd))
+
+    class MEventMessage:
+        @staticmethod
+        def addEventCallback(event: str, func: Callable) -> int:
+            _record("addEventCallback", event)
+            callbackId = next(_callbackIds)
+            _callbacks[callbackId] = (event, func)
+            return callbackId
+
+    class MMessage:
+        @staticmethod
+        def removeCallback(callbackId: int) -> None:
+            _record("removeCallback", callbackId)
+            _callbacks.pop(callbackId, None)
+
+    openMaya = _module("maya.OpenMaya", MEventMessage=MEventMessage, MMessage=MMessage)
+    _module("maya", cmds=cmds, mel=mel, OpenMaya=openMaya, __path__=[])
+
+    class Window:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def asQtObject(self):
+            return None
+
+    core = _module("pymel.core", select=_select, ls=_ls, warning=_warning, error=_error, about=_about,
+                   ui=types.SimpleNamespace(Window=Window))
+    _module("pymel", core=core, __path__=[])
+
+
+def install(force: bool = False) -> bool:
+    """
+    Make the stub importable as maya and pymel.
+
+    :param force: Replace the maya package even when the real one is available.
+
+    :return: True if the stub is installed, False if the real Maya is used.
+    """
+    global _installed
+    if _installed:
+        return True
+    if not force and importlib.util.find_spec("maya") is not None:
+        return False
+    _build()
+    _installed = True
+    return True
@@ -0,0 +1,173 @@
+"""
+Picker memory benchmark.
+
+Measure the memory and time used to build pickers the way create_node did
+before, a QGraphicsTextItem with a model dict and a font and colors of its
+own, against the current PickNode with the shared fonts and colors of
+Core.nodeStyle. Python allocations are traced with tracemalloc, the Qt side
+only shows in the resident set size. Also compare the size of the node list
+saved with inline styles and with a style table.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m PuppetMaster.Benchmarks.memory
+"""
+import json
+import os
+import random
+import time
+import tracemalloc
+from uuid import uuid4
+from typing import List
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication, QGraphicsItem, QGraphicsTextItem
+from PuppetMaster.Core.PySideLibrary.QtGui import QColor, QFont
+from PuppetMaster.Core.PySideLibrary.QtCore import Signal
+
+from PuppetMaster.Core.qnodes import PickNode, CommandType, PIINode, PIIPick, PickShape
+from PuppetMaster.Core.nodeStyle import StyleTable, get_font, get_color
+
+NODE_COUNTS = (1000, 5000)
+SIZES = (8, 10, 12)
+COLORS = ((255, 255, 255), (178, 34, 34), (0, 0, 0), (255, 255, 0), (0, 128, 255))
+
+
+def random_styles(count: int, seed: int = 0) -> List[tuple]:
+    """ Get (size, textColor, bgColor) for each node, from a handful of styles like a real rig. """
+    rnd = random.Random(seed)
+    return [(rnd.choice(SIZES), rnd.choice(COLORS), rnd.choice(COLORS)) for _ in range(count)]
+
+
+class TextPickNode(QGraphicsTextItem):
+    """
+    Previous PickNode without its drawing, a QGraphicsTextItem with a model dict.
+    """
+    onClick = Signal()
+    onSelected = Signal(list)
+    onAddToStack = Signal()
+    onRemoveFromStack = Signal()
+    onItemsChanged = Signal(object, list, list)
+    onGeometryChanged = Signal(object)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._highlight = False
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.document().documentLayout().documentSizeChanged.connect(self.geometry_changed)
+        self._model = {'bgColor': QColor(255, 255, 255), 'command': "", 'commandsType': CommandType.PYTHON,
+                       'item': [], 'shape': PickShape.SQUARE, 'id': str(uuid4())}
+
+    def geometry_changed(self, *args) -> None:
+        self.onGeometryChanged.emit(self)
+
+
+def build_inline(styles: List[tuple]) -> List[TextPickNode]:
+    """ Previous create_node, every node is a text item owning its font and colors. """
+    nodes = []
+    for size, textColor, bgColor in styles:
+        node = TextPickNode()
+        node._model["bgColor"] = QColor(*bgColor)
+        font = QFont("SansSerif", size)
+        font.setStyleHint(QFont.Helvetica)
+        node.setFont(font)
+        node.setDefaultTextColor(QColor(*textColor))
+        node.setPlainText("Node")
+        # laid out like addItem does
+        node.boundingRect()
+        nodes.append(node)
+    return nodes
+
+
+def build_shared(styles: List[tuple]) -> List[PickNode]:
+    """ Current create_node, nodes share the interned font and colors. """
+    nodes = []
+    for size, textColor, bgColor in styles:
+        node = PickNode()
+        node.setFont(get_font(size))
+        node.setDefaultTextColor(get_color(textColor))
+        node.Background = bgColor
+        node.setPlainText("Node")
+        # laid out like addItem does
+        node.boundingRect()
+        nodes.append(node)
+    return nodes
+
+
+def resident_size() -> int:
+    """ Get the resident set size of the process in bytes, 0 where /proc is not available. """
+    try:
+        with open("/proc/self/statm") as infile:
+            return int(infile.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def measure(func, styles: List[tuple]) -> dict:
+    """
+    Get the memory allocated and the time spent building the nodes.
+    """
+    rss = resident_size()
+    tracemalloc.start()
+    start = time.perf_counter()
+    nodes = func(styles)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {'bytes_per_node': current / len(nodes),
+              'rss_per_node': (resident_size() - rss) / len(nodes),
+              'us_per_node': elapsed / len(nodes) * 1e6}
+    del nodes
+    return result
+
+
+def saved_size(styles: List[tuple]) -> dict:
+    """
+    Get the size of the node list in .pii json with inline styles and with a style table.
+    """
+    inline = []
+    table = StyleTable()
+    indexed = []
+    for index, (size, textColor, bgColor) in enumerate(styles):
+        node = {PIIPick.TYPE: PIINode.PICK, PIIPick.TEXT: "Node", PIIPick.POSITION: (index * 1.5, index * 2.5),
+                PIIPick.SELECTION: ["ns:ctrl_{}".format(index)], PIIPick.SHAPE: "square"}
+        inline.append(dict(node, **{PIIPick.SIZE: size, PIIPick.COLOR: textColor, PIIPick.BACKGROUND: bgColor}))
+        indexed.append(dict(node, **{PIIPick.STYLE: table.add(size, textColor, bgColor)}))
+    compact = {'separators': (',', ':')}
+    return {'inline_bytes': len(json.dumps(inline, **compact)),
+            'table_bytes': len(json.dumps(indexed, **compact)) + len(json.dumps(table.raw(), **compact))}
+
+
+def run(counts=NODE_COUNTS) -> List[dict]:
+    """
+    Run the benchmark for each node count.
+
+    :param counts: List of node counts.
+    """
+    results = []
+    for count in counts:
+        styles = random_styles(count)
+        # warm up the interned fonts and Qt type caches
+        build_shared(styles[:10])
+        build_inline(styles[:10])
+        # the shared run goes first so the resident set is not reusing the pages freed by the other
+        shared = measure(build_shared, styles)
+        inline = measure(build_inline, styles)
+        result = {'nodes': count}
+        result.update({'inline_' + key: value for key, value in inline.items()})
+        result.update({'shared_' + key: value for key, value in shared.items()})
+        result.update(saved_size(styles))
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    QApplication.instance() or QApplication([])
+    print("{:>6} {:>13} {:>13} {:>13} {:>13} {:>11} {:>11} {:>11} {:>11}".format(
+        "nodes", "inline py/n", "shared py/n", "inline rss/n", "shared rss/n", "inline us", "shared us",
+        "inline json", "table json"))
+    for r in run():
+        print("{nodes:>6} {inline_bytes_per_node:>13.0f} {shared_bytes_per_node:>13.0f} {inline_rss_per_node:>13.0f} "
+              "{shared_rss_per_node:>13.0f} {inline_us_per_node:>11.1f} {shared_us_per_node:>11.1f} "
+              "{inline_bytes:>11} {table_bytes:>11}".format(**r))
+
+
+if __name__ == '__main__':
+    main()
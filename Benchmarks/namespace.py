@@ -0,0 +1,110 @@
+"""
+Namespace remap benchmark.
+
+Remap the selections of a crowd picker, many referenced characters each with
+its own namespace, with the substring replacement CanvasGraphicsView.set_namespace
+did before and with the compiled NamespaceRemapper. The nested layout puts half
+of the controls in a namespace nested in the character, and maps every level
+the way NamespaceDialog does, the nested ones to themselves.
+
+Usage: python -m PuppetMaster.Benchmarks.namespace
+"""
+import time
+from typing import Dict, List
+
+from PuppetMaster.Core.namespaceRemap import NamespaceRemapper
+
+CHARACTERS = (10, 40)
+LAYOUTS = ("flat", "nested")
+PICKERS_PER_CHARACTER = 300
+NAMES_PER_PICKER = 3
+
+
+def substring_remap(valueList: List[str], data: Dict[str, str]) -> List[str]:
+    """ Previous set_namespace, for the selection of one picker. """
+    newValue = []
+    for sObj in valueList:
+        if ":" in sObj:
+            nameS = ":".join(sObj.split(":")[:-1])
+            object_name = sObj.split(":")[-1]
+            keys = list(data.keys())
+            keys.sort(reverse=True)
+            for key in keys:
+                if key in nameS:
+                    nameS = nameS.replace(key, data[key], 1)
+            nameS = nameS[1:] if nameS.startswith(":") else nameS
+            nameS = ":".join([nameS, object_name]) if nameS else object_name
+            newValue.append(nameS)
+        else:
+            newValue.append(sObj)
+    return newValue
+
+
+def compiled_remap(pickers: List[List[str]], data: Dict[str, str]) -> List[List[str]]:
+    """ Current set_namespace. """
+    remapper = NamespaceRemapper(data)
+    return [remapper.names(items) for items in pickers]
+
+
+def build(characters: int, layout: str = "flat") -> tuple:
+    """
+    Get the picker selections and the namespace mapping of a crowd shot.
+
+    :param characters: Number of referenced characters.
+    :param layout: "flat" or "nested" namespaces.
+    """
+    pickers = []
+    for character in range(characters):
+        for picker in range(PICKERS_PER_CHARACTER):
+            namespace = "crowd:char{}".format(character)
+            if layout == "nested" and picker % 2:
+                namespace += ":face"
+            pickers.append(["{}:ctrl_{}_{}".format(namespace, picker, index) for index in range(NAMES_PER_PICKER)])
+    data = {"crowd:char{}".format(character): "shot010:char{}".format(character) for character in range(characters)}
+    if layout == "nested":
+        data["crowd"] = "crowd"
+        for character in range(characters):
+            data["crowd:char{}:face".format(character)] = "crowd:char{}:face".format(character)
+    return pickers, data
+
+
+def expected_names(pickers: List[List[str]]) -> List[List[str]]:
+    """ Get the selections with every character moved to the shot010 namespace. """
+    return [["shot010:" + name[len("crowd:"):] for name in items] for items in pickers]
+
+
+def run(counts=CHARACTERS, layouts=LAYOUTS) -> List[dict]:
+    """
+    Run the benchmark for each number of characters and namespace layout.
+
+    :param counts: List of character counts.
+    :param layouts: List of namespace layouts, see build.
+    """
+    results = []
+    for layout in layouts:
+        for characters in counts:
+            pickers, data = build(characters, layout)
+            expected = expected_names(pickers)
+            start = time.perf_counter()
+            before = [substring_remap(items, data) for items in pickers]
+            substringTime = time.perf_counter() - start
+            start = time.perf_counter()
+            after = compiled_remap(pickers, data)
+            compiledTime = time.perf_counter() - start
+            results.append({'layout': layout, 'characters': characters, 'names': len(pickers) * NAMES_PER_PICKER,
+                            'substring_ms': substringTime * 1e3, 'compiled_ms': compiledTime * 1e3,
+                            'substring_wrong': sum(a != b for a, b in zip(before, expected)),
+                            'compiled_wrong': sum(a != b for a, b in zip(after, expected))})
+    return results
+
+
+def main() -> None:
+    print("{:>8} {:>10} {:>8} {:>14} {:>13} {:>16} {:>15}".format(
+        "layout", "characters", "names", "substring (ms)", "compiled (ms)", "substring wrong", "compiled wrong"))
+    for r in run():
+        print("{layout:>8} {characters:>10} {names:>8} {substring_ms:>14.1f} {compiled_ms:>13.1f} "
+              "{substring_wrong:>16} {compiled_wrong:>15}".format(**r))
+
+
+if __name__ == '__main__':
+    main()
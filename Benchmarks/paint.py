@@ -0,0 +1,95 @@
+"""
+Picker paint benchmark.
+
+Render panning frames of a thousand nodes of each PickShape, and of
+ButtonNodes, with and without the device coordinate cache.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m PuppetMaster.Benchmarks.paint
+"""
+import time
+from typing import List
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication, QGraphicsItem, QGraphicsScene, QGraphicsView
+from PuppetMaster.Core.PySideLibrary.QtGui import QPainter
+
+from PuppetMaster.Core.qnodes import PickNode, ButtonNode, PickShape
+
+NODE_COUNT = 1000
+COLUMNS = 40
+SPACING = 40
+VIEW_WIDTH = 1280
+VIEW_HEIGHT = 720
+SHAPES = (PickShape.SQUARE, PickShape.CIRCLE, PickShape.TRIANGLE, PickShape.PLUS, "button")
+
+
+def build_scene(shape: str, count: int = NODE_COUNT) -> QGraphicsScene:
+    """
+    Build a grid of nodes of the same shape.
+
+    :param shape: PickShape name, or "button" for ButtonNodes.
+    :param count: Number of nodes.
+    """
+    scene = QGraphicsScene()
+    for index in range(count):
+        if shape == "button":
+            node = ButtonNode()
+            node.setPlainText("Button")
+        else:
+            node = PickNode()
+            node.setPlainText("  ")
+            node.Shape = shape
+            node.Highlight = bool(index % 2)
+        node.setPos((index % COLUMNS) * SPACING, (index // COLUMNS) * SPACING)
+        scene.addItem(node)
+    return scene
+
+
+def time_frames(view: QGraphicsView, frames: int) -> float:
+    """
+    Get the average repaint time of a panning view in milliseconds.
+    """
+    bar = view.horizontalScrollBar()
+    # first frame fills the caches
+    view.viewport().repaint()
+    start = time.perf_counter()
+    for frame in range(frames):
+        bar.setValue(bar.minimum() + (frame * 7) % max(1, bar.maximum() - bar.minimum()))
+        view.viewport().repaint()
+    return (time.perf_counter() - start) / frames * 1e3
+
+
+def run(shapes=SHAPES, frames: int = 50) -> List[dict]:
+    """
+    Run the benchmark for each shape.
+
+    :param shapes: List of shape names.
+    :param frames: Number of frames to render.
+    """
+    results = []
+    for shape in shapes:
+        scene = build_scene(shape)
+        view = QGraphicsView(scene)
+        view.setRenderHint(QPainter.Antialiasing)
+        view.resize(VIEW_WIDTH, VIEW_HEIGHT)
+        view.scale(0.8, 0.8)
+        view.show()
+        QApplication.processEvents()
+        result = {'shape': shape}
+        for key, mode in (('uncached_ms', QGraphicsItem.NoCache), ('cached_ms', QGraphicsItem.DeviceCoordinateCache)):
+            for item in scene.items():
+                item.setCacheMode(mode)
+            result[key] = time_frames(view, frames)
+        results.append(result)
+        view.close()
+        scene.clear()
+    return results
+
+
+def main() -> None:
+    QApplication.instance() or QApplication([])
+    print("{:>10} {:>14} {:>14}".format("shape", "uncached (ms)", "cached (ms)"))
+    for result in run():
+        print("{shape:>10} {uncached_ms:>14.2f} {cached_ms:>14.2f}".format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Rubber-band selection benchmark.
+
+Drag a rubber band over a grid of PickNodes, out to the full grid and back
+to half of it, then build the outgoing Maya selection. Only the time spent
+keeping the stack and building the selection is counted, not Qt's. The selection stack is kept the way
+CanvasGraphicsView did before, a list with a Maya selection concatenated
+from every node, and with the current SelectionStack.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m PuppetMaster.Benchmarks.selection
+"""
+import time
+from typing import Any, List
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication, QGraphicsItem, QGraphicsScene
+from PuppetMaster.Core.PySideLibrary.QtGui import QPainterPath
+from PuppetMaster.Core.PySideLibrary.QtCore import QRectF
+
+from PuppetMaster.Core.qnodes import PickNode
+from PuppetMaster.Core.selectionIndex import SelectionStack
+
+NODE_COUNTS = (250, 1000, 4000)
+COLUMNS = 40
+SPACING = 40
+# controls selected by each picker, neighbour pickers share some of them
+NAMES_PER_NODE = 4
+DRAG_STEPS = 40
+
+
+class ListStack:
+    """ Previous selection stack of CanvasGraphicsView. """
+
+    def __init__(self) -> None:
+        self._stack = []
+
+    def add(self, node: Any, names: List[str]) -> None:
+        self._stack.append(node)
+
+    def remove(self, node: Any) -> None:
+        if node in self._stack:
+            index = self._stack.index(node)
+            self._stack.pop(index)
+
+    def names(self) -> List[str]:
+        selection = []
+        for each in self._stack:
+            selection += each.Items
+        return selection
+
+
+def build_scene(count: int) -> QGraphicsScene:
+    """
+    Build a grid of selectable PickNodes.
+
+    :param count: Number of nodes.
+    """
+    scene = QGraphicsScene()
+    for index in range(count):
+        node = PickNode()
+        node.setPlainText("  ")
+        node.setFlag(QGraphicsItem.ItemIsSelectable)
+        node.Items = ["ctrl_{}".format(index + offset) for offset in range(NAMES_PER_NODE)]
+        node.setPos((index % COLUMNS) * SPACING, (index // COLUMNS) * SPACING)
+        scene.addItem(node)
+    return scene
+
+
+def drag(scene: QGraphicsScene, stack) -> dict:
+    """
+    Drag a rubber band out and back, keeping the stack in sync with the scene
+    selection like CanvasGraphicsView.selection_changed, then build the Maya selection.
+    """
+    previous = set()
+    elapsed = 0.0
+
+    def selection_changed():
+        nonlocal previous, elapsed
+        selected = scene.selectedItems()
+        start = time.perf_counter()
+        current = set(selected)
+        for each in previous - current:
+            stack.remove(each)
+        for each in selected:
+            if each not in previous:
+                stack.add(each, each.Items)
+        previous = current
+        elapsed += time.perf_counter() - start
+
+    scene.selectionChanged.connect(selection_changed)
+    full = scene.itemsBoundingRect()
+    steps = list(range(1, DRAG_STEPS + 1)) + list(range(DRAG_STEPS - 1, DRAG_STEPS // 2 - 1, -1))
+    for step in steps:
+        area = QPainterPath()
+        area.addRect(QRectF(full.topLeft(), full.size() * (step / DRAG_STEPS)))
+        scene.setSelectionArea(area)
+    # mouse release
+    start = time.perf_counter()
+    selection = stack.names()
+    elapsed += time.perf_counter() - start
+    scene.selectionChanged.disconnect(selection_changed)
+    scene.clearSelection()
+    return {'ms': elapsed * 1e3, 'names': len(selection)}
+
+
+def run(counts=NODE_COUNTS) -> List[dict]:
+    """
+    Run the benchmark for each node count.
+
+    :param counts: List of node counts.
+    """
+    results = []
+    for count in counts:
+        scene = build_scene(count)
+        before = drag(scene, ListStack())
+        after = drag(scene, SelectionStack())
+        results.append({'nodes': count, 'list_ms': before['ms'], 'list_names': before['names'],
+                        'stack_ms': after['ms'], 'stack_names': after['names']})
+        scene.clear()
+    return results
+
+
+def main() -> None:
+    QApplication.instance() or QApplication([])
+    print("{:>6} {:>10} {:>11} {:>11} {:>12}".format("nodes", "list (ms)", "list names", "stack (ms)", "stack names"))
+    for r in run():
+        print("{nodes:>6} {list_ms:>10.1f} {list_names:>11} {stack_ms:>11.1f} {stack_names:>12}".format(**r))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+Headless benchmark suite.
+
+Generate synthetic .pii files of N pickers selecting K Maya objects each,
+then time loading, saving, highlighting, namespace remapping, fitting and
+painting them with the canvas and tab widget used in Maya. Maya is replaced
+by the FakeBackend, or by Benchmarks.mayaStub behind the Maya backend, so it
+runs anywhere PySide6 does. The results are printed as JSON, to be kept and
+compared between releases.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m PuppetMaster.Benchmarks.suite
+           [--pickers 500 5000] [--names 1 8] [--repeat 5] [--backend fake|maya] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+from PuppetMaster.Benchmarks import mayaStub
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication
+from PuppetMaster.Core.PySideLibrary.QtGui import QColor, QImage, QLinearGradient, QPainter
+from PuppetMaster.Core.PySideLibrary.QtCore import QBuffer, QByteArray, QIODevice, QSize, qVersion
+
+from PuppetMaster.Core.qnodes import PII, PIINode, PIIPick, PickShape, PickNode
+from PuppetMaster.Core.nodeStyle import StyleTable
+from PuppetMaster.Core.piiFile import VERSION_2, write_pii
+from PuppetMaster.Core.dccBackend import FakeBackend, MayaBackend, set_backend
+from PuppetMaster.UI.CustomeTabWidget import CanvasGraphicsViewTab
+
+PICKER_COUNTS = (500, 5000)
+NAME_COUNTS = (1, 8)
+REPEAT = 5
+CHARACTERS = 4
+COLUMNS = 80
+SPACING = 30
+BACKGROUND_SIZE = QSize(1920, 1080)
+VIEW_WIDTH = 1280
+VIEW_HEIGHT = 720
+PAINT_FRAMES = 20
+SHAPES = (PickShape.SQUARE, PickShape.CIRCLE, PickShape.TRIANGLE, PickShape.PLUS)
+COLORS = ((255, 255, 255), (178, 34, 34), (0, 0, 0), (255, 255, 0), (0, 128, 255))
+
+
+def background_png() -> bytes:
+    """ Get a gradient background image in PNG format. """
+    image = QImage(BACKGROUND_SIZE, QImage.Format_RGB32)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, BACKGROUND_SIZE.width(), BACKGROUND_SIZE.height())
+    gradient.setColorAt(0, QColor(40, 40, 60))
+    gradient.setColorAt(1, QColor(120, 140, 160))
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def object_names(pickers: int, names: int) -> List[List[str]]:
+    """
+    Get the Maya objects selected by each picker, spread over a few referenced characters.
+
+    :param pickers: Number of pickers.
+    :param names: Number of Maya objects selected by each picker.
+    """
+    return [["char{}:ctrl_{}_{}".format(index % CHARACTERS, index, name) for name in range(names)]
+            for index in range(pickers)]
+
+
+def generate_pii(path: str, pickers: int, names: int, seed: int = 0) -> None:
+    """
+    Write a synthetic v2 .pii file.
+
+    :param path: Path of .PII file.
+    :param pickers: Number of pickers.
+    :param names: Number of Maya objects selected by each picker.
+    :param seed: Seed of the random styles and shapes.
+    """
+    rnd = random.Random(seed)
+    styles = StyleTable()
+    nodes = []
+    for index, items in enumerate(object_names(pickers, names)):
+        nodes.append({
+            PIIPick.TYPE: PIINode.PICK,
+            PIIPick.TEXT: "  ",
+            PIIPick.POSITION: ((index % COLUMNS) * SPACING, (index // COLUMNS) * SPACING),
+            PIIPick.SELECTION: items,
+            PIIPick.SHAPE: rnd.choice(SHAPES),
+            PIIPick.STYLE: styles.add(rnd.choice((8, 10, 12)), rnd.choice(COLORS), rnd.choice(COLORS))
+        })
+    write_pii(path, {
+        PII.VERSION: VERSION_2,
+        PII.BACKGROUND: background_png(),
+        PII.IMAGE_FORMAT: "png",
+        PII.NODES: nodes,
+        PII.STYLES: styles.raw()
+    })
+
+
+def measure(func: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> dict:
+    """
+    Time a function.
+
+    :param func: Function to time.
+    :param repeat: Number of runs.
+    :param setup: Function called before each run, not timed.
+
+    :return: Minimum, median and maximum run time in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1e3)
+    return {'min_ms': min(times), 'median_ms': statistics.median(times), 'max_ms': max(times)}
+
+
+def close_tabs(tab: CanvasGraphicsViewTab) -> None:
+    """ Close every tab without the confirmation of closeTab. """
+    while tab.graphs:
+        tab.remove_tab(len(tab.graphs) - 1)
+    QApplication.processEvents()
+
+
+def run_case(directory: str, pickers: int, names: int, repeat: int) -> dict:
+    """
+    Run every benchmark on a synthetic picker.
+
+    :param directory: Directory to write the .pii files in.
+    :param pickers: Number of pickers.
+    :param names: Number of Maya objects selected by each picker.
+    :param repeat: Number of runs of each benchmark.
+    """
+    path = os.path.join(directory, "bench_{}x{}.pii".format(pickers, names))
+    savePath = os.path.join(directory, "bench_{}x{}_saved.pii".format(pickers, names))
+    generate_pii(path, pickers, names)
+    result = {'pickers': pickers, 'names': names, 'file_bytes': os.path.getsize(path)}
+
+    tab = CanvasGraphicsViewTab()
+    tab.resize(VIEW_WIDTH, VIEW_HEIGHT)
+    tab.show()
+
+    def load() -> None:
+        tab.load_set(path).finish_loading()
+
+    result['load_set'] = measure(load, repeat, setup=lambda: close_tabs(tab))
+    canvas = tab.get_node()
+    QApplication.processEvents()
+
+    result['get_raw'] = measure(canvas.get_raw, repeat)
+    tab.set_path(savePath)
+    result['save_set'] = measure(tab.save_set, repeat)
+
+    # a tenth of the rig selected in Maya
+    selection = [name for items in object_names(pickers, names)[::10] for name in items]
+    highlights = iter([selection, []] * repeat)
+    result['set_highlight'] = measure(lambda: canvas.set_highlight(next(highlights)), repeat * 2)
+
+    renamed = {"char{}".format(index): "shot010:char{}".format(index) for index in range(CHARACTERS)}
+    restored = {value: key for key, value in renamed.items()}
+    mappings = iter([renamed, restored] * repeat)
+    result['set_namespace'] = measure(lambda: canvas.set_namespace(next(mappings)), repeat * 2)
+
+    # move a node so the scene bounds have to be updated
+    nodes = [item for item in canvas.scene().items() if type(item) == PickNode]
+    offsets = iter(range(1, repeat + 1))
+    result['fit_contents'] = measure(canvas.fit_contents, repeat,
+                                     setup=lambda: nodes[0].moveBy(next(offsets) * SPACING, 0))
+
+    canvas.reset_view()
+    canvas.scale(2, 2)
+    QApplication.processEvents()
+    bar = canvas.horizontalScrollBar()
+    frames = iter(range(repeat * PAINT_FRAMES))
+    canvas.viewport().repaint()
+
+    def paint() -> None:
+        bar.setValue(bar.minimum() + (next(frames) * 37) % max(1, bar.maximum() - bar.minimum()))
+        canvas.viewport().repaint()
+
+    result['paint'] = measure(paint, repeat * PAINT_FRAMES)
+
+    close_tabs(tab)
+    tab.close()
+    tab.deleteLater()
+    QApplication.processEvents()
+    return result
+
+
+def run(pickerCounts=PICKER_COUNTS, nameCounts=NAME_COUNTS, repeat: int = REPEAT, backend: str = "fake") -> dict:
+    """
+    Run the suite for each size of picker.
+
+    :param pickerCounts: List of picker counts.
+    :param nameCounts: List of Maya object counts per picker.
+    :param repeat: Number of runs of each benchmark.
+    :param backend: "fake" for the FakeBackend, "maya" for the Maya backend.
+
+    :return: Report of the environment and the results.
+    """
+    if backend == "maya":
+        mayaStub.install()
+        set_backend(MayaBackend())
+    else:
+        set_backend(FakeBackend())
+    app = QApplication.instance() or QApplication([])
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        # shared background images would hide the encoding cost of save_set
+        os.environ.pop("PM_IMAGES_DIR", None)
+        for pickers in pickerCounts:
+            for names in nameCounts:
+                results.append(run_case(directory, pickers, names, repeat))
+    return {
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'qt': qVersion(),
+        'platform': platform.platform(),
+        'qpa': app.platformName(),
+        'repeat': repeat,
+        'backend': backend,
+        'results': results
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pickers", type=int, nargs="+", default=PICKER_COUNTS, help="picker counts")
+    parser.add_argument("--names", type=int, nargs="+", default=NAME_COUNTS, help="Maya objects per picker")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs of each benchmark")
+    parser.add_argument("--backend", choices=("fake", "maya"), default="fake", help="host application backend")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+    report = run(args.pickers, args.names, args.repeat, args.backend)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            outfile.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+from bisect import bisect_left
+from functools import lru_cache
+from types import CodeType
+from typing import Dict
+
+# Number of distinct Python commands kept compiled by compile_command
+COMMAND_CACHE_SIZE = 512
+COMMAND_FILENAME = "<PuppetMaster command>"
+
+
+@lru_cache(maxsize=COMMAND_CACHE_SIZE)
+def compile_command(cmd: str) -> CodeType:
+    """
+    Compile a Python command once, every button running the same source shares
+    the code. Hit and miss statistics are available from compile_command.cache_info().
+
+    :param cmd: Python source of the command.
+
+    :return: Code object to exec, SyntaxError is raised and not cached.
+    """
+    return compile(cmd, COMMAND_FILENAME, "exec")
+
+
+class CommandStats():
+    """
+    Execution time of the runs of a command.
+    """
+    __slots__ = ('runs', 'errors', 'total', 'last', 'max')
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.runs = 0
+        self.errors = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """
+        Record a successful run.
+
+        :param seconds: Execution time of the run.
+        """
+        self.runs += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+    def mean(self) -> float:
+        """ Get the mean execution time in seconds. """
+        return self.total / self.runs if self.runs else 0.0
+
+    def raw(self) -> Dict[str, float]:
+        """
+        Get the statistics with the times in milliseconds.
+        """
+        return {'runs': self.runs, 'errors': self.errors, 'total_ms': self.total * 1e3,
+                'mean_ms': self.mean() * 1e3, 'last_ms': self.last * 1e3, 'max_ms': self.max * 1e3}
+
+    def __str__(self) -> str:
+        if not self.runs:
+            return "Not run yet"
+        return "Ran {} times, last {:.2f} ms, mean {:.2f} ms, max {:.2f} ms".format(
+            self.runs, self.last * 1e3, self.mean() * 1e3, self.max * 1e3)
+
+
+class LatencyHistogram():
+    """
+    Counts of latencies in buckets of growing size, from a click to the end of its command.
+    """
+    # upper bound of each bucket in milliseconds, the last bucket has no upper bound
+    BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+    __slots__ = ('counts', 'total')
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+
+    def add(self, seconds: float) -> None:
+        """
+        Count a latency.
+
+        :param seconds: Latency in seconds.
+        """
+        self.counts[bisect_left(self.BOUNDS, seconds * 1e3)] += 1
+        self.total += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get the upper bound of the bucket holding the percentile.
+
+        :param percent: Percentile, between 0 and 100.
+
+        :return: Latency in milliseconds, inf for the last bucket and 0 if nothing was counted.
+        """
+        if not self.total:
+            return 0.0
+        rank = percent / 100.0 * self.total
+        count = 0
+        for index, bucket in enumerate(self.counts):
+            count += bucket
+            if count >= rank and bucket:
+                return float(self.BOUNDS[index]) if index < len(self.BOUNDS) else float("inf")
+        return float("inf")
+
+    def raw(self) -> Dict[str, int]:
+        """
+        Get the counts by bucket name, "<=1ms" to ">5000ms".
+        """
+        buckets = {"<={}ms".format(bound): count for bound, count in zip(self.BOUNDS, self.counts)}
+        buckets[">{}ms".format(self.BOUNDS[-1])] = self.counts[-1]
+        return buckets
@@ -0,0 +1,194 @@
+import time
+import traceback
+from collections import deque
+from typing import Dict, Optional
+from PuppetMaster.Core.PySideLibrary.QtCore import QObject, QTimer, Signal
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication
+
+from PuppetMaster.Core.qnodes import ButtonNode, CommandType
+from PuppetMaster.Core.commandCache import LatencyHistogram, COMMAND_FILENAME
+from PuppetMaster.Core.mayaHelper import execPython, runMel
+
+_runner: Optional["CommandRunner"] = None
+
+
+class LogLevel():
+    INFO = "info"
+    WARNING = "warning"
+    ERROR = "error"
+
+
+def format_error(err: Exception) -> str:
+    """
+    Get the traceback of a failed command, starting at the command itself.
+
+    :param err: Exception raised by the command.
+    """
+    tb = err.__traceback__
+    while tb is not None and tb.tb_frame.f_code.co_filename != COMMAND_FILENAME:
+        tb = tb.tb_next
+    return "".join(traceback.format_exception(type(err), err, tb)).rstrip()
+
+
+class CommandJob():
+    """
+    A command waiting to run.
+    """
+    __slots__ = ('cmdType', 'cmd', 'node', 'name', 'submitted')
+
+    def __init__(self, cmdType: str, cmd: str, node: Optional[ButtonNode] = None) -> None:
+        self.cmdType = cmdType
+        self.cmd = cmd
+        self.node = node
+        # shown in the log, the button text or the first line of the command
+        self.name = node.toPlainText() if node is not None else ""
+        self.name = self.name or cmd.strip().split("\n", 1)[0]
+        self.submitted = time.perf_counter()
+
+    def key(self) -> tuple:
+        return self.node, self.cmdType, self.cmd
+
+
+class CommandRunner(QObject):
+    """
+    Queue of the button commands, run one per event loop turn so the press
+    repaints first. The same command submitted again while it's waiting, or
+    within the double-click interval, is dropped. Errors are reported with
+    onLog instead of message boxes, and the latency from the submit to the
+    end of each command is counted in a histogram per command.
+    """
+    onLog = Signal(str, str)
+    onFinished = Signal(object)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._queue = deque()
+        self._pending = set()
+        self._last = None
+        self._lastTime = 0.0
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._stats = {'submitted': 0, 'deduplicated': 0, 'ran': 0, 'errors': 0}
+        # None follows the double-click interval of the platform
+        self.dedupeInterval: Optional[int] = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.run_next)
+
+    def submit(self, cmdType: str, cmd: str, node: Optional[ButtonNode] = None) -> bool:
+        """
+        Queue a command.
+
+        :param cmdType: Type of command.("python"/"mel")
+        :param cmd: Command to run.
+        :param node: ButtonNode of the command, its globals and timing are used.
+
+        :return: False if the command was dropped as a duplicate, otherwise True.
+        """
+        if not cmd:
+            return False
+        job = CommandJob(cmdType, cmd, node)
+        key = job.key()
+        self._stats['submitted'] += 1
+        interval = self.dedupeInterval
+        if interval is None:
+            interval = QApplication.doubleClickInterval()
+        if key in self._pending or (key == self._last and job.submitted - self._lastTime < interval / 1000.0):
+            self._stats['deduplicated'] += 1
+            return False
+        self._last = key
+        self._lastTime = job.submitted
+        self._pending.add(key)
+        self._queue.append(job)
+        self._timer.start()
+        return True
+
+    def run_next(self) -> None:
+        """
+        Run the oldest queued command.
+        """
+        if not self._queue:
+            self._timer.stop()
+            return
+        job = self._queue.popleft()
+        self._pending.discard(job.key())
+        if not self._queue:
+            self._timer.stop()
+        self.execute(job)
+
+    def flush(self) -> None:
+        """
+        Run every queued command right away.
+        """
+        while self._queue:
+            self.run_next()
+
+    def execute(self, job: CommandJob) -> bool:
+        """
+        Run a command and record its timing.
+
+        :param job: Command to run.
+
+        :return: False if the command failed, otherwise True.
+        """
+        node = job.node
+        try:
+            if node is not None and node.Command != job.cmd:
+                node = None
+        except RuntimeError:
+            # the button was deleted while its command was waiting
+            node = None
+        start = time.perf_counter()
+        success = True
+        try:
+            if CommandType(job.cmdType) == CommandType.PYTHON:
+                execPython(job.cmd, node.Scope if node is not None else None)
+            elif CommandType(job.cmdType) == CommandType.MEL:
+                runMel(job.cmd)
+        except Exception as err:
+            success = False
+            self._stats['errors'] += 1
+            self.onLog.emit(LogLevel.ERROR, "{}\n{}".format(job.name, format_error(err)))
+        end = time.perf_counter()
+        self._stats['ran'] += 1
+        if node is not None:
+            node.record_run(end - start, success)
+        histogram = self._histograms.get(job.cmd)
+        if histogram is None:
+            histogram = self._histograms[job.cmd] = LatencyHistogram()
+        histogram.add(end - job.submitted)
+        self.onFinished.emit(job)
+        return success
+
+    def is_pending(self) -> bool:
+        """ Check if any command is waiting to run. """
+        return bool(self._queue)
+
+    def get_histogram(self, cmd: str) -> LatencyHistogram:
+        """
+        Get the latency histogram of a command.
+
+        :param cmd: Command.
+        """
+        return self._histograms.get(cmd) or LatencyHistogram()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the number of submitted, deduplicated, ran and failed commands.
+        """
+        return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        """ Reset the counters and the histograms. """
+        for key in self._stats:
+            self._stats[key] = 0
+        self._histograms.clear()
+
+
+def get_command_runner() -> CommandRunner:
+    """
+    Get the command runner, shared by every canvas for the whole session.
+    """
+    global _runner
+    if _runner is None:
+        _runner = CommandRunner()
+    return _runner
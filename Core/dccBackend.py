@@ -0,0 +1,384 @@
+import importlib.util
+import sys
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QWidget
+
+_backend: Optional["DCCBackend"] = None
+_qtGlobals: Optional[Dict[str, object]] = None
+
+
+def lazy_import(name: str):
+    """
+    Import a module on the first access to one of its attributes.
+
+    :param name: Full name of the module.
+
+    :return: Module, or None if it can't be found.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class DCCBackend(ABC):
+    """
+    Interface of the host application, the only calls PuppetMaster makes to it.
+    """
+    name = ""
+
+    @abstractmethod
+    def select(self, nodes: List[str], add: bool = True) -> None:
+        """
+        Select objects.
+
+        :param nodes: List of object's name.
+        :param add: Add to the selection, otherwise replace it.
+        """
+
+    @abstractmethod
+    def clear_selection(self) -> None:
+        """ Clear the selection. """
+
+    @abstractmethod
+    def selected(self) -> List[str]:
+        """ Get the short names of the selected objects. """
+
+    @abstractmethod
+    def namespaces(self) -> List[str]:
+        """ Get all the namespaces of the scene. """
+
+    @abstractmethod
+    def run_mel(self, cmd: str) -> None:
+        """
+        Run mel commands.
+
+        :param cmd: Commands to run.
+        """
+
+    def script_globals(self) -> Dict[str, object]:
+        """
+        Get the names available to the Python commands of the buttons, the
+        QtWidgets names they always had.
+        """
+        global _qtGlobals
+        if _qtGlobals is None:
+            from PuppetMaster.Core.PySideLibrary import QtWidgets
+            _qtGlobals = {name: getattr(QtWidgets, name) for name in dir(QtWidgets) if not name.startswith("_")}
+        return dict(_qtGlobals)
+
+    @abstractmethod
+    def version(self) -> str:
+        """ Get the version of the application. """
+
+    @abstractmethod
+    def warning(self, msg: str) -> None:
+        """ Print out a warning message. """
+
+    @abstractmethod
+    def error(self, msg: str) -> None:
+        """ Print out an error message and raise RuntimeError. """
+
+    def main_window(self) -> Optional[QWidget]:
+        """ Get the main window of the application. """
+        return None
+
+    @abstractmethod
+    def open_undo_chunk(self, name: str) -> None:
+        """
+        Start collecting the following changes in one undo step.
+
+        :param name: Name of the undo step.
+        """
+
+    @abstractmethod
+    def close_undo_chunk(self) -> None:
+        """ Close the undo step opened by open_undo_chunk. """
+
+    @abstractmethod
+    def suspend_refresh(self, suspend: bool) -> None:
+        """
+        Suspend or resume the viewport refresh.
+
+        :param suspend: True to suspend, False to resume.
+        """
+
+    @contextmanager
+    def batch(self, name: str) -> Iterator[None]:
+        """
+        Run the block as one undo step with the viewport refresh suspended,
+        both are restored even if the block raises.
+
+        :param name: Name of the undo step.
+        """
+        self.open_undo_chunk(name)
+        self.suspend_refresh(True)
+        try:
+            yield
+        finally:
+            self.suspend_refresh(False)
+            self.close_undo_chunk()
+
+    @abstractmethod
+    def add_selection_callback(self, func: Callable[[], None]) -> object:
+        """
+        Call the function whenever the selection changes.
+
+        :param func: Function to call.
+
+        :return: Id of the callback, to remove it.
+        """
+
+    @abstractmethod
+    def remove_callback(self, callbackId: object) -> None:
+        """
+        Remove a callback.
+
+        :param callbackId: Id returned when the callback was added.
+        """
+
+
+class MayaBackend(DCCBackend):
+    """
+    Maya through maya.cmds only. Maya modules are imported on their first use,
+    PyMEL is only imported by the Python commands using it.
+    """
+    name = "maya"
+
+    def __init__(self) -> None:
+        self._cmds = None
+
+    @property
+    def cmds(self):
+        if self._cmds is None:
+            from maya import cmds
+            self._cmds = cmds
+        return self._cmds
+
+    def select(self, nodes: List[str], add: bool = True) -> None:
+        if add:
+            # an empty list would clear the selection
+            if nodes:
+                self.cmds.select(nodes, add=True)
+        elif nodes:
+            self.cmds.select(nodes, replace=True)
+        else:
+            self.cmds.select(clear=True)
+
+    def clear_selection(self) -> None:
+        self.cmds.select(clear=True)
+
+    def selected(self) -> List[str]:
+        return self.cmds.ls(selection=True, long=False) or []
+
+    def namespaces(self) -> List[str]:
+        self.cmds.namespace(setNamespace=':')
+        return self.cmds.namespaceInfo(listOnlyNamespaces=True, recurse=True) or []
+
+    def run_mel(self, cmd: str) -> None:
+        from maya import mel
+        mel.eval(cmd)
+
+    def script_globals(self) -> Dict[str, object]:
+        from maya import mel
+        names = super().script_globals()
+        names.update({"cmds": self.cmds, "mel": mel, "pm": lazy_import("pymel.core")})
+        return names
+
+    def version(self) -> str:
+        return str(self.cmds.about(version=True))
+
+    def warning(self, msg: str) -> None:
+        self.cmds.warning(msg)
+
+    def error(self, msg: str) -> None:
+        self.cmds.error(msg)
+
+    def main_window(self) -> Optional[QWidget]:
+        from maya import OpenMayaUI
+        from shiboken6 import wrapInstance
+        from PuppetMaster.Core.PySideLibrary.QtWidgets import QMainWindow
+        pointer = OpenMayaUI.MQtUtil.mainWindow()
+        return wrapInstance(int(pointer), QMainWindow) if pointer is not None else None
+
+    def open_undo_chunk(self, name: str) -> None:
+        self.cmds.undoInfo(openChunk=True, chunkName=name)
+
+    def close_undo_chunk(self) -> None:
+        self.cmds.undoInfo(closeChunk=True)
+
+    def suspend_refresh(self, suspend: bool) -> None:
+        self.cmds.refresh(suspend=suspend)
+        if not suspend:
+            self.cmds.refresh()
+
+    def add_selection_callback(self, func: Callable[[], None]) -> object:
+        from maya import OpenMaya
+        return OpenMaya.MEventMessage.addEventCallback("SelectionChanged", lambda *args: func())
+
+    def remove_callback(self, callbackId: object) -> None:
+        from maya import OpenMaya
+        OpenMaya.MMessage.removeCallback(callbackId)
+
+
+class FakeCmds():
+    """
+    Recording stand-in of maya.cmds for the commands run with the FakeBackend.
+    select and ls work on the selection of the backend, any other command is
+    only recorded in its calls as ("cmds.<name>", args, kwargs).
+    """
+
+    def __init__(self, backend: "FakeBackend") -> None:
+        self._backend = backend
+
+    def select(self, *args, **kwargs) -> None:
+        self._backend.calls.append(("cmds.select", args, kwargs))
+        if kwargs.get("clear"):
+            self._backend.set_selection([])
+            return
+        nodes = list(args[0]) if len(args) == 1 and isinstance(args[0], (list, tuple)) else list(args)
+        if kwargs.get("add"):
+            nodes = self._backend.selection + [name for name in nodes if name not in self._backend.selection]
+        self._backend.set_selection(nodes)
+
+    def ls(self, *args, **kwargs) -> List[str]:
+        self._backend.calls.append(("cmds.ls", args, kwargs))
+        if kwargs.get("selection") or kwargs.get("sl"):
+            return list(self._backend.selection)
+        return []
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._backend.calls.append(("cmds." + name, args, kwargs))
+
+
+class FakeMel():
+    """
+    Stand-in of maya.mel for the commands run with the FakeBackend, eval goes to run_mel.
+    """
+
+    def __init__(self, backend: "FakeBackend") -> None:
+        self._backend = backend
+
+    def eval(self, cmd: str) -> None:
+        self._backend.run_mel(cmd)
+
+
+class FakeBackend(DCCBackend):
+    """
+    In-memory scene for tests and benchmarks. Every call is recorded in calls,
+    the Python commands get the recording FakeCmds and FakeMel as cmds and mel.
+    """
+    name = "fake"
+
+    def __init__(self, namespaces: Optional[List[str]] = None) -> None:
+        """
+        :param namespaces: Namespaces of the scene.
+        """
+        self.calls: List[tuple] = []
+        self.selection: List[str] = []
+        self.sceneNamespaces: List[str] = list(namespaces or [])
+        self._callbacks: Dict[int, Callable[[], None]] = {}
+        self._nextId = 1
+        self.cmds = FakeCmds(self)
+        self.mel = FakeMel(self)
+
+    def select(self, nodes: List[str], add: bool = True) -> None:
+        self.calls.append(("select", list(nodes), add))
+        if not add:
+            self.selection = []
+        self.selection.extend(name for name in nodes if name not in self.selection)
+        self._selection_changed()
+
+    def clear_selection(self) -> None:
+        self.calls.append(("clear_selection",))
+        self.selection = []
+        self._selection_changed()
+
+    def selected(self) -> List[str]:
+        self.calls.append(("selected",))
+        return list(self.selection)
+
+    def namespaces(self) -> List[str]:
+        self.calls.append(("namespaces",))
+        return list(self.sceneNamespaces)
+
+    def run_mel(self, cmd: str) -> None:
+        self.calls.append(("run_mel", cmd))
+
+    def script_globals(self) -> Dict[str, object]:
+        names = super().script_globals()
+        names.update({"cmds": self.cmds, "mel": self.mel})
+        return names
+
+    def version(self) -> str:
+        return "fake"
+
+    def warning(self, msg: str) -> None:
+        self.calls.append(("warning", msg))
+
+    def error(self, msg: str) -> None:
+        self.calls.append(("error", msg))
+        raise RuntimeError(msg)
+
+    def open_undo_chunk(self, name: str) -> None:
+        self.calls.append(("open_undo_chunk", name))
+
+    def close_undo_chunk(self) -> None:
+        self.calls.append(("close_undo_chunk",))
+
+    def suspend_refresh(self, suspend: bool) -> None:
+        self.calls.append(("suspend_refresh", suspend))
+
+    def add_selection_callback(self, func: Callable[[], None]) -> object:
+        callbackId = self._nextId
+        self._nextId += 1
+        self._callbacks[callbackId] = func
+        return callbackId
+
+    def remove_callback(self, callbackId: object) -> None:
+        self._callbacks.pop(callbackId, None)
+
+    def set_selection(self, nodes: List[str]) -> None:
+        """
+        Change the selection the way a user in the application would.
+
+        :param nodes: List of object's name.
+        """
+        self.selection = list(nodes)
+        self._selection_changed()
+
+    def _selection_changed(self) -> None:
+        for func in list(self._callbacks.values()):
+            func()
+
+
+def get_backend() -> DCCBackend:
+    """
+    Get the backend of the host application, Maya unless another one is set.
+    """
+    global _backend
+    if _backend is None:
+        _backend = MayaBackend()
+    return _backend
+
+
+def set_backend(backend: Optional[DCCBackend]) -> None:
+    """
+    Set the backend of the host application.
+
+    :param backend: Backend to use, None for the default one.
+    """
+    global _backend
+    _backend = backend
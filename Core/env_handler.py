@@ -2,6 +2,8 @@ import os
 
 PM_WORK_DIR = 'PM_ROOT_DIR'
 PM_TEMPLATE_DIR = 'PM_TEMPLATES_DIR'
+PM_IMAGE_DIR = 'PM_IMAGES_DIR'
+PM_PII_VERSION = 'PM_PII_VERSION'
 
 
 # Handling PM_TEMPLATE_DIR
@@ -52,3 +54,41 @@ def get_PMWorkDir() -> str:
         Get the project path
     """
     return os.getenv(PM_WORK_DIR, "")
+
+
+# Handling PM_IMAGE_DIR
+def is_PMImageDir() -> bool:
+    """
+    Check if the PM_IMAGE_DIR key exist in environment variables.
+
+    Return
+    ------
+    out: (boolean)
+        True if the key exists in environment varibales, otherwise False.
+    """
+    return True if PM_IMAGE_DIR in os.environ else False
+
+
+def get_PMImageDir() -> str:
+    """
+    Get the shared background images path from environemnt variables.
+
+    Return
+    ------
+    out: (str)
+        Get the images path
+    """
+    return os.getenv(PM_IMAGE_DIR, "")
+
+
+# Handling PM_PII_VERSION
+def get_PMPiiVersion() -> str:
+    """
+    Get the version of the saved .pii files from environment variables.
+
+    Return
+    ------
+    out: (str)
+        Version of .pii data, empty for the default one.
+    """
+    return os.getenv(PM_PII_VERSION, "")
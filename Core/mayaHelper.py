@@ -1,8 +1,7 @@
-from typing import List
-from maya import cmds
-from maya import mel
-import pymel.core as pm
+from typing import List, Optional
 from PuppetMaster.Core.PySideLibrary.QtWidgets import *
+from PuppetMaster.Core.dccBackend import get_backend
+from PuppetMaster.Core.commandCache import compile_command
 
 
 def selectObjects(nodes: List[str]) -> None:
@@ -10,16 +9,24 @@ def selectObjects(nodes: List[str]) -> None:
     Select objects in maya.
     :param nodes:List of object's name
     """
-    pm.select(nodes, add=True)
+    get_backend().select(nodes, add=True)
 
 
 def clearSelection() -> None:
     """ Clear Maya selection. """
-    pm.select(clear=True)
+    get_backend().clear_selection()
+
+
+def replaceSelection(nodes: List[str]) -> None:
+    """
+    Replace Maya selection in a single call.
+    :param nodes: List of object's name, an empty list clears the selection.
+    """
+    get_backend().select(nodes, add=False)
 
 
 def getActiveItems() -> List[str]:
-    return cmds.ls(selection=True, long=False)
+    return get_backend().selected()
 
 
 def runMel(cmd: str) -> None:
@@ -27,7 +34,7 @@ def runMel(cmd: str) -> None:
     Run mel commands.
     :param cmd: Commands to run.
     """
-    mel.eval(cmd)
+    get_backend().run_mel(cmd)
 
 
 def mayaNamespace() -> List[str]:
@@ -39,22 +46,48 @@ def mayaNamespace() -> List[str]:
     out: (list)
         List of Maya namespaces.
     """
-    cmds.namespace(setNamespace=':')
-    return cmds.namespaceInfo(listOnlyNamespaces=True, recurse=True)
+    return get_backend().namespaces()
+
 
+def execPython(cmd: str, scope: Optional[dict] = None) -> None:
+    """
+    Run python commands, compiled once per distinct source. Errors are raised.
 
-def runPython(cmd: str) -> None:
+    :param cmd: Commands in Python language.
+    :param scope: Globals of the commands, kept between runs to share their variables.
+                  Without it, every run starts from new globals.
+    """
+    scope = {} if scope is None else scope
+    # exec adds __builtins__, a scope is only filled before its first run
+    if "__builtins__" not in scope:
+        names = get_backend().script_globals()
+        # the helpers of this module were available to the commands too
+        names.update((name, value) for name, value in globals().items() if not name.startswith("_"))
+        for name, value in names.items():
+            scope.setdefault(name, value)
+    exec(compile_command(cmd), scope)
+
+
+def runPython(cmd: str, scope: Optional[dict] = None) -> bool:
     """
-    Run python commands.
+    Run python commands, errors are shown in a message box.
 
     Parameters
     ----------
     cmd: (str)
         commands in Python language.
+    scope: (dict)
+        Globals of the commands, kept between runs to share their variables.
+        Without it, every run starts from new globals.
+
+    Return
+    ------
+    out: (bool)
+        False if the commands failed, otherwise True.
     """
     if cmd:
         try:
-            exec(cmd)
+            execPython(cmd, scope)
         except SyntaxError as err:
             dial = QMessageBox()
             dial.setText(str(err))
@@ -62,6 +95,7 @@ def runPython(cmd: str) -> None:
             dial.setIcon(QMessageBox.Warning)
             dial.addButton('Ok', QMessageBox.RejectRole)
             dial.exec_()
+            return False
         except Exception as err:
             dial = QMessageBox()
             dial.setText(str(err))
@@ -69,22 +103,24 @@ def runPython(cmd: str) -> None:
             dial.setIcon(QMessageBox.Warning)
             dial.addButton('Ok', QMessageBox.RejectRole)
             dial.exec_()
+            return False
+    return True
 
 
 def maya_version() -> str:
     """ Get current maya versions. """
-    return pm.about(version=True)
+    return get_backend().version()
 
 
 def warningMes(msg: str) -> None:
     """ Print out a warning message. """
-    pm.warning(msg)
+    get_backend().warning(msg)
 
 
 def errorMes(msg: str) -> None:
     """ Print out an error message. """
-    pm.error(msg)
+    get_backend().error(msg)
 
 
 def mayaMainWindow() -> QMainWindow:
-    return pm.ui.Window("MayaWindow").asQtObject()
+    return get_backend().main_window()
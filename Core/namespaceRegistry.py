@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List, Optional
+
+
+class NamespaceRegistry:
+    """
+    Reference counted namespaces of the Maya object names selected by the nodes.
+    Every parent level of a namespace is registered too.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._sorted: Optional[List[str]] = None
+
+    def add(self, names: Iterable[str]) -> None:
+        """
+        Register the namespaces of the object names.
+
+        :param names: List of Maya object names.
+        """
+        for namespace in self._levels(names):
+            count = self._counts.get(namespace, 0)
+            if not count:
+                self._sorted = None
+            self._counts[namespace] = count + 1
+
+    def remove(self, names: Iterable[str]) -> None:
+        """
+        Unregister the namespaces of the object names.
+
+        :param names: List of Maya object names.
+        """
+        for namespace in self._levels(names):
+            count = self._counts.get(namespace, 0) - 1
+            if count > 0:
+                self._counts[namespace] = count
+            elif namespace in self._counts:
+                del self._counts[namespace]
+                self._sorted = None
+
+    def update(self, oldNames: Iterable[str], newNames: Iterable[str]) -> None:
+        """
+        Replace the namespaces of the old object names with the new ones.
+
+        :param oldNames: Previous list of Maya object names.
+        :param newNames: Current list of Maya object names.
+        """
+        self.remove(oldNames)
+        self.add(newNames)
+
+    def namespaces(self) -> List[str]:
+        """
+        Get all the registered namespaces.
+
+        :return: Sorted list of namespaces.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._counts)
+        return list(self._sorted)
+
+    def first(self) -> Optional[str]:
+        """
+        Get the first namespace in sorted order.
+
+        :return: Namespace, None if there isn't any.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._counts)
+        return self._sorted[0] if self._sorted else None
+
+    def clear(self) -> None:
+        """ Remove every namespace from the registry. """
+        self._counts.clear()
+        self._sorted = None
+
+    @staticmethod
+    def _levels(names: Iterable[str]) -> Iterable[str]:
+        for name in names:
+            namespace, separator, _ = name.rpartition(":")
+            if separator:
+                levels = namespace.split(":")
+                for index in range(len(levels)):
+                    yield ":".join(levels[:index + 1])
+
+    def __contains__(self, namespace: str) -> bool:
+        return namespace in self._counts
+
+    def __len__(self) -> int:
+        return len(self._counts)
@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, List
+
+
+class NamespaceRemapper:
+    """
+    Namespace mapping compiled once and applied to many Maya object names.
+
+    A namespace is renamed by the one key matching its longest prefix, the
+    namespace itself or one of its parent namespaces, never the middle of a
+    namespace. Keys mapped to themselves are ignored, so renaming a parent
+    also renames the namespaces nested in it. Only one key applies, so keys
+    can swap namespaces without renaming them twice.
+    Each namespace is only resolved once.
+    """
+
+    def __init__(self, mapping: Dict[str, str]) -> None:
+        """
+        :param mapping: Dictionary of namespace with value of new namespace.
+        """
+        self._mapping = {key: value for key, value in mapping.items() if value != key}
+        self._cache: Dict[str, str] = {}
+
+    def namespace(self, namespace: str) -> str:
+        """
+        Remap a namespace.
+
+        :param namespace: Namespace, without the object name.
+
+        :return: New namespace, without leading ':'.
+        """
+        result = self._cache.get(namespace)
+        if result is None:
+            result = namespace
+            prefix = namespace
+            while prefix:
+                newNamespace = self._mapping.get(prefix)
+                if newNamespace is not None:
+                    result = newNamespace + namespace[len(prefix):]
+                    break
+                prefix = prefix.rpartition(":")[0]
+            # making sure doesn't start with ':'
+            result = result[1:] if result.startswith(":") else result
+            self._cache[namespace] = result
+        return result
+
+    def name(self, name: str) -> str:
+        """
+        Remap the namespace of a Maya object name.
+
+        :param name: Maya object name.
+
+        :return: Object name in the new namespace.
+        """
+        namespace, separator, objectName = name.rpartition(":")
+        if not separator:
+            return name
+        namespace = self.namespace(namespace)
+        return "{}:{}".format(namespace, objectName) if namespace else objectName
+
+    def names(self, names: Iterable[str]) -> List[str]:
+        """
+        Remap the namespace of Maya object names.
+
+        :param names: List of Maya object names.
+
+        :return: List of object names in the new namespaces.
+        """
+        return [self.name(name) for name in names]
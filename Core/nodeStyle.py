@@ -0,0 +1,109 @@
+from typing import Dict, List, Tuple, Union, Optional
+from PuppetMaster.Core.PySideLibrary.QtGui import QFont, QColor
+
+FONT_FAMILY = "SansSerif"
+
+# Interned fonts and colors shared by every node, they must not be modified.
+_fonts: Dict[int, QFont] = {}
+_colors: Dict[Tuple[int, ...], QColor] = {}
+
+
+def get_font(size: int) -> QFont:
+    """
+    Get the shared node font of the size.
+
+    :param size: Point size of the font.
+
+    :return: Shared QFont.
+    """
+    font = _fonts.get(size)
+    if font is None:
+        font = QFont(FONT_FAMILY, size)
+        font.setStyleHint(QFont.Helvetica)
+        _fonts[size] = font
+    return font
+
+
+def get_color(value: Union[QColor, Tuple[int, ...], List[int]]) -> QColor:
+    """
+    Get the shared color of the value.
+
+    :param value: QColor or (r, g, b[, a]) values.
+
+    :return: Shared QColor.
+    """
+    if isinstance(value, QColor):
+        key = (value.red(), value.green(), value.blue(), value.alpha())
+    else:
+        key = tuple(value)
+        if len(key) == 3:
+            key += (255,)
+    color = _colors.get(key)
+    if color is None:
+        color = QColor(*key)
+        _colors[key] = color
+    return color
+
+
+def color_raw(color: QColor) -> Tuple[int, int, int]:
+    """ Get the (r, g, b) values saved in .pii files. """
+    return color.red(), color.green(), color.blue()
+
+
+class StyleTable:
+    """
+    Table of the distinct (size, text color, background color) styles of a .pii file.
+    Nodes refer to a style by its index in the table.
+    """
+    SIZE = "size"
+    COLOR = "text_color"
+    BACKGROUND = "background_color"
+
+    def __init__(self, raw: Optional[List[dict]] = None) -> None:
+        self._styles: List[Tuple[int, Tuple[int, ...], Tuple[int, ...]]] = []
+        self._keys: Dict[Tuple[int, Tuple[int, ...], Tuple[int, ...]], int] = {}
+        for each in raw or []:
+            self.add(each[self.SIZE], each[self.COLOR], each[self.BACKGROUND])
+
+    def add(self, size: int, textColor: Union[QColor, Tuple[int, ...]], bgColor: Union[QColor, Tuple[int, ...]]) -> int:
+        """
+        Add the style to the table if it's new.
+
+        :param size: Point size of the text.
+        :param textColor: Color of the text.
+        :param bgColor: Background color of the node.
+
+        :return: Index of the style.
+        """
+        if isinstance(textColor, QColor):
+            textColor = color_raw(textColor)
+        if isinstance(bgColor, QColor):
+            bgColor = color_raw(bgColor)
+        key = (size, tuple(textColor), tuple(bgColor))
+        index = self._keys.get(key)
+        if index is None:
+            index = len(self._styles)
+            self._styles.append(key)
+            self._keys[key] = index
+        return index
+
+    def get(self, index: int) -> Tuple[QFont, QColor, QColor]:
+        """
+        Get the shared font and colors of the style.
+
+        :param index: Index of the style.
+
+        :return: Font, text color and background color.
+        """
+        size, textColor, bgColor = self._styles[index]
+        return get_font(size), get_color(textColor), get_color(bgColor)
+
+    def raw(self) -> List[dict]:
+        """
+        Get the table to be saved in .pii file.
+        """
+        return [{self.SIZE: size, self.COLOR: textColor, self.BACKGROUND: bgColor}
+                for size, textColor, bgColor in self._styles]
+
+    def __len__(self) -> int:
+        return len(self._styles)
@@ -0,0 +1,195 @@
+import base64
+import hashlib
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Optional
+from PuppetMaster.Core.PySideLibrary.QtGui import QImage
+
+from PuppetMaster.Core.qnodes import PII
+
+VERSION_1 = "1.0.0"
+VERSION_2 = "2.0.0"
+
+# v2 container entries
+MANIFEST = "manifest.json"
+NODES = "nodes.json"
+STYLES = "styles.json"
+BACKGROUND = "background"
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def read_pii(path: str) -> dict:
+    """
+    Read a .pii file of any version.
+
+    Parameters
+    ----------
+    path: (str)
+        Path of .PII file.
+
+    Return
+    ------
+    out: (dict)
+        Dictionary of scene data. v2 files keep the background as raw image bytes.
+    """
+    if zipfile.is_zipfile(path):
+        return _read_2_0_0(path)
+    with open(path, 'r') as outfile:
+        return json.load(outfile)
+
+
+def decode_pii(path: str) -> dict:
+    """
+    Read a .pii file and decode its background image.
+    Safe to run outside the GUI thread, the image is decoded into a QImage.
+
+    Parameters
+    ----------
+    path: (str)
+        Path of .PII file.
+
+    Return
+    ------
+    out: (dict)
+        Dictionary of scene data, with the decoded background under PII.IMAGE.
+    """
+    data = read_pii(path)
+    image = QImage()
+    background = data.get(PII.BACKGROUND)
+    if background:
+        if data[PII.VERSION] == VERSION_1:
+            background = base64.b64decode(background)
+        image.loadFromData(background)
+    data[PII.IMAGE] = image
+    return data
+
+
+def decode_pii_async(path: str) -> Future:
+    """
+    Read and decode a .pii file on a worker thread.
+
+    Parameters
+    ----------
+    path: (str)
+        Path of .PII file.
+
+    Return
+    ------
+    out: (Future)
+        Future of the decode_pii result.
+    """
+    return run_async(decode_pii, path)
+
+
+def run_async(func: Callable, *args) -> Future:
+    """
+    Run the function on the worker threads used to read .pii files.
+
+    Parameters
+    ----------
+    func: (Callable)
+        Function to run, it must not touch any widget.
+
+    Return
+    ------
+    out: (Future)
+        Future of the function result.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4), thread_name_prefix="PuppetMaster")
+    return _executor.submit(func, *args)
+
+
+def write_pii(path: str, data: dict, imageDir: str = "") -> None:
+    """
+    Write the scene data to a .pii file, in the format of its version.
+
+    Parameters
+    ----------
+    path: (str)
+        Path of .PII file.
+    data: (dict)
+        Dictionary of scene data.
+    imageDir: (str)
+        Directory of shared background images. When set, v2 files reference the
+        background by content hash instead of embedding it.
+    """
+    tempPath = path + ".tmp"
+    if data.get(PII.VERSION) == VERSION_2:
+        _write_2_0_0(tempPath, data, imageDir)
+    else:
+        with open(tempPath, 'w') as outfile:
+            json.dump(data, outfile, ensure_ascii=False, indent=4)
+    os.replace(tempPath, path)
+
+
+def _write_2_0_0(path: str, data: dict, imageDir: str) -> None:
+    image = data.get(PII.BACKGROUND) or b""
+    imageFormat = data.get(PII.IMAGE_FORMAT) or "png"
+    manifest = {
+        PII.VERSION: VERSION_2,
+        PII.IMAGE_FORMAT: imageFormat if image else "",
+        PII.BACKGROUND: "",
+        PII.IMAGE_REF: ""
+    }
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        if image and imageDir:
+            manifest[PII.IMAGE_REF] = _write_shared_image(path, image, imageFormat, imageDir)
+        elif image:
+            # images are compressed already, store them as they are
+            manifest[PII.BACKGROUND] = "{}.{}".format(BACKGROUND, imageFormat)
+            archive.writestr(manifest[PII.BACKGROUND], image, compress_type=zipfile.ZIP_STORED)
+        archive.writestr(NODES, json.dumps(data.get(PII.NODES, []), ensure_ascii=False, separators=(',', ':')))
+        if data.get(PII.STYLES):
+            archive.writestr(STYLES, json.dumps(data[PII.STYLES], separators=(',', ':')))
+        archive.writestr(MANIFEST, json.dumps(manifest, indent=4))
+
+
+def _write_shared_image(path: str, image: bytes, imageFormat: str, imageDir: str) -> str:
+    """
+    Write the image into the shared directory, named by its content hash.
+
+    Return
+    ------
+    out: (str)
+        Path of the image, relative to the .pii file when possible.
+    """
+    if not os.path.exists(imageDir):
+        os.makedirs(imageDir)
+    imagePath = os.path.join(imageDir, "{}.{}".format(hashlib.sha256(image).hexdigest(), imageFormat))
+    if not os.path.isfile(imagePath):
+        with open(imagePath + ".tmp", 'wb') as outfile:
+            outfile.write(image)
+        os.replace(imagePath + ".tmp", imagePath)
+    try:
+        imagePath = os.path.relpath(imagePath, os.path.dirname(os.path.abspath(path)))
+    except ValueError:
+        # different drive
+        pass
+    return imagePath.replace("\\", "/")
+
+
+def _read_2_0_0(path: str) -> dict:
+    with zipfile.ZipFile(path, 'r') as archive:
+        manifest = json.loads(archive.read(MANIFEST))
+        nodes = json.loads(archive.read(NODES))
+        # files without a style table keep the style inline in each node
+        styles = json.loads(archive.read(STYLES)) if STYLES in archive.namelist() else []
+        image = b""
+        if manifest.get(PII.BACKGROUND):
+            image = archive.read(manifest[PII.BACKGROUND])
+    if manifest.get(PII.IMAGE_REF):
+        imagePath = os.path.join(os.path.dirname(os.path.abspath(path)), os.path.expandvars(manifest[PII.IMAGE_REF]))
+        with open(imagePath, 'rb') as infile:
+            image = infile.read()
+    return {
+        PII.VERSION: manifest[PII.VERSION],
+        PII.BACKGROUND: image,
+        PII.IMAGE_FORMAT: manifest.get(PII.IMAGE_FORMAT, ""),
+        PII.NODES: nodes,
+        PII.STYLES: styles
+    }
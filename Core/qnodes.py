@@ -1,17 +1,31 @@
 from typing import Any
 from enum import Enum
+from functools import lru_cache
 from uuid import uuid4
 from PuppetMaster.Core.PySideLibrary.QtWidgets import *
 from PuppetMaster.Core.PySideLibrary.QtGui import *
 from PuppetMaster.Core.PySideLibrary.QtCore import *
 
+from PuppetMaster.Core.nodeStyle import get_color, get_font
+from PuppetMaster.Core.commandCache import CommandStats
+
 IMAGE_FORMATS = (".jpeg", ".jpg", ".png", ".exr", ".gif")
+# Number of picker outlines kept by shape_path
+SHAPE_CACHE_SIZE = 256
+# Same margin and default size as the QTextDocument of a QGraphicsTextItem
+TEXT_MARGIN = 4
+DEFAULT_FONT_SIZE = 9
 
 
 class PII():
     BACKGROUND = "background"
     VERSION = "version"
     NODES = "nodes"
+    IMAGE_FORMAT = "background_format"
+    IMAGE_REF = "background_ref"
+    STYLES = "styles"
+    # decoded QImage, never saved
+    IMAGE = "background_image"
 
 
 class PIINode():
@@ -28,6 +42,8 @@ class PIIPick():
     SIZE = 'size'
     SELECTION = "selection"
     SHAPE = 'shape'
+    # index in the PII.STYLES table, replaces SIZE, COLOR and BACKGROUND
+    STYLE = 'style'
 
 
 class PickShape():
@@ -37,6 +53,61 @@ class PickShape():
     TRIANGLE = "triangle"
 
 
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def shape_path(shape: str, width: float, height: float, inset: float = 0) -> QPainterPath:
+    """
+    Get the outline of a picker shape, shared by every node of the same size.
+    Hit and miss statistics are available from shape_path.cache_info().
+
+    Parameters
+    ----------
+    shape: (str)
+        Name of the PickShape.
+    width: (float)
+        Width of the node.
+    height: (float)
+        Height of the node.
+    inset: (float)
+        Distance of the outline from the node border, in pixels for the circle
+        and plus, in percentage of the size for the triangle.
+
+    Return
+    ------
+    out: (QPainterPath)
+        Outline in node coordinates, must not be modified.
+    """
+    path = QPainterPath()
+    if shape == PickShape.CIRCLE:
+        path.addEllipse(QRectF(inset, inset, width - (inset * 2), height - (inset * 2)))
+    elif shape == PickShape.TRIANGLE:
+        wOffset = (inset * width) / 100
+        hOffset = (inset * height) / 100
+        p1 = QPointF(width / 2, hOffset)
+        path.moveTo(p1)
+        path.lineTo(width - wOffset, height - hOffset)
+        path.lineTo(wOffset, height - hOffset)
+        path.lineTo(p1)
+    elif shape == PickShape.PLUS:
+        widthSec = width / 3
+        heightSec = height / 3
+        path.moveTo(widthSec + inset, 0 + inset)
+        path.lineTo((widthSec * 2) - inset, 0 + inset)
+        path.lineTo((widthSec * 2) - inset, heightSec + inset)
+        path.lineTo((widthSec * 3) - inset, heightSec + inset)
+        path.lineTo((widthSec * 3) - inset, (heightSec * 2) - inset)
+        path.lineTo((widthSec * 2) - inset, (heightSec * 2) - inset)
+        path.lineTo((widthSec * 2) - inset, (heightSec * 3) - inset)
+        path.lineTo(widthSec + inset, (heightSec * 3) - inset)
+        path.lineTo(widthSec + inset, (heightSec * 2) - inset)
+        path.lineTo(0 + inset, (heightSec * 2) - inset)
+        path.lineTo(0 + inset, heightSec + inset)
+        path.lineTo(widthSec + inset, heightSec + inset)
+        path.lineTo(widthSec + inset, 0 + inset)
+    else:
+        path.addRect(QRectF(inset, inset, width - (inset * 2), height - (inset * 2)))
+    return path
+
+
 class PIIButton():
     TEXT = "text"
     POSITION = "position"
@@ -46,6 +117,8 @@ class PIIButton():
     SIZE = 'size'
     COMMAND = "command"
     COMMANDTYPE = "command_type"
+    # index in the PII.STYLES table, replaces SIZE, COLOR and BACKGROUND
+    STYLE = 'style'
 
 
 class CommandType(Enum):
@@ -53,90 +126,188 @@ class CommandType(Enum):
     MEL = "mel"
 
 
-class PickNode(QGraphicsTextItem):
+class PickData():
+    """
+    Data of a PickNode.
+    """
+    __slots__ = ('text', 'font', 'textColor', 'bgColor', 'items', 'shape', 'id', 'highlight', 'lines', 'rect')
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.font = get_font(DEFAULT_FONT_SIZE)
+        self.textColor = get_color((0, 0, 0))
+        self.bgColor = get_color((255, 255, 255))
+        self.items = []
+        self.shape = PickShape.SQUARE
+        # created on first use
+        self.id = None
+        self.highlight = False
+        # (position, QStaticText) of each line of text
+        self.lines = []
+        self.rect = QRectF()
+
+
+class PickTextEditor(QGraphicsTextItem):
+    """
+    Text editor shown over a PickNode while its text is being edited.
+    """
+    onEditingFinished = Signal()
+
+    def focusOutEvent(self, event: QFocusEvent) -> None:
+        super().focusOutEvent(event)
+        self.onEditingFinished.emit()
+
+
+# A QGraphicsWidget keeps its geometry on the C++ side, so painting and the scene
+# index don't call a Python boundingRect. The text is drawn from QStaticText and
+# a QTextDocument only exists while the text is edited.
+class PickNode(QGraphicsWidget):
     onClick = Signal()
-    onSelected = Signal(list)
-    onAddToStack = Signal()
-    onRemoveFromStack = Signal()
+    onItemsChanged = Signal(object, list, list)
+    onGeometryChanged = Signal(object)
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self._highlight = False
-        self.init()
-
-    def init(self) -> None:
-        self._model = {
-            'bgColor': QColor(255, 255, 255),
-            'command': "",
-            'commandsType': CommandType.PYTHON,
-            'item': [],
-            'shape': 'square',
-            'id': str(uuid4())
-        }
-        self.update_tooltip()
+        self._data = PickData()
+        self._editor = None
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+        # repaint from a pixmap until a setter calls update()
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.update_text()
 
     def set_Id(self, value: str) -> None:
-        self._model["id"] = value
+        self._data.id = value
 
     def get_id(self) -> str:
-        return self._model["id"]
+        if self._data.id is None:
+            self._data.id = str(uuid4())
+        return self._data.id
 
     id = property(get_id, set_Id)
 
     def get_brush(self) -> QColor:
-        return self._model["bgColor"]
+        return self._data.bgColor
 
     def set_brush(self, value: QColor) -> None:
-        self._model["bgColor"] = QColor(value)
+        self._data.bgColor = get_color(value)
         self.update()
 
     Background = property(get_brush, set_brush)
 
     def get_items(self) -> list:
-        return self._model["item"]
+        return self._data.items
 
     def set_items(self, names: list) -> None:
-        self._model["item"] = names
+        oldNames = self._data.items
+        self._data.items = names
         self.update_tooltip()
+        self.onItemsChanged.emit(self, oldNames, names)
 
     Items = property(get_items, set_items)
 
     def get_shape(self) -> str:
-        return self._model["shape"]
+        return self._data.shape
 
     def set_shape(self, name: str) -> None:
-        self._model["shape"] = name
+        # shape() follows the name
+        self.prepareGeometryChange()
+        self._data.shape = name
         self.update()
 
     Shape = property(get_shape, set_shape)
 
     def update_tooltip(self) -> None:
-        if self._model["item"]:
-            self.setToolTip("\n".join(self._model["item"]))
+        if self._data.items:
+            self.setToolTip("\n".join(self._data.items))
 
-    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget) -> None:
-        if self._model["shape"] == PickShape.SQUARE:
+    def toPlainText(self) -> str:
+        return self._data.text
+
+    def setPlainText(self, text: str) -> None:
+        self._data.text = text
+        self.update_text()
+
+    def font(self) -> QFont:
+        return QFont(self._data.font)
+
+    def setFont(self, font: QFont) -> None:
+        self._data.font = font
+        self.update_text()
+
+    def defaultTextColor(self) -> QColor:
+        return QColor(self._data.textColor)
+
+    def setDefaultTextColor(self, color: QColor) -> None:
+        self._data.textColor = get_color(color)
+        self.update()
+
+    def update_text(self) -> None:
+        """
+        Lay out the text again and resize the node around it.
+        """
+        self.layout_text()
+        self.resize(self._data.rect.size())
+        self.update()
+        self.geometry_changed()
+
+    def layout_text(self) -> None:
+        """
+        Lay out the text in static lines and resize the node around it, with the
+        same margin as a QGraphicsTextItem.
+        """
+        lines = []
+        width = 0
+        height = TEXT_MARGIN
+        for line in self._data.text.split("\n"):
+            staticText = QStaticText(line)
+            staticText.setTextFormat(Qt.PlainText)
+            staticText.prepare(QTransform(), self._data.font)
+            lines.append((QPointF(TEXT_MARGIN, height), staticText))
+            width = max(width, staticText.size().width())
+            height += staticText.size().height()
+        self._data.lines = lines
+        self._data.rect = QRectF(0, 0, width + (TEXT_MARGIN * 2), height + TEXT_MARGIN)
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None) -> None:
+        if self._data.shape == PickShape.SQUARE:
             self.draw_square(painter)
             # text
-            super().paint(painter, option, widget)
-        elif self._model["shape"] == PickShape.CIRCLE:
+            self.draw_text(painter, option)
+        elif self._data.shape == PickShape.CIRCLE:
             self.draw_circle(painter)
-        elif self._model["shape"] == PickShape.TRIANGLE:
+        elif self._data.shape == PickShape.TRIANGLE:
             self.draw_triangle(painter)
-        elif self._model["shape"] == PickShape.PLUS:
+        elif self._data.shape == PickShape.PLUS:
             self.draw_plus(painter)
 
+    def draw_text(self, painter: QPainter, option: QStyleOptionGraphicsItem) -> None:
+        if self._editor is None:
+            painter.setFont(self._data.font)
+            painter.setPen(self._data.textColor)
+            for position, staticText in self._data.lines:
+                painter.drawStaticText(position, staticText)
+        if option.state & QStyle.State_Selected:
+            # same selection outline as QGraphicsTextItem
+            boundry = self.boundingRect().adjusted(0.5, 0.5, -0.5, -0.5)
+            fgColor = option.palette.windowText().color()
+            bgColor = QColor(*(0 if value > 127 else 255 for value in fgColor.getRgb()[:3]))
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(bgColor, 0, Qt.SolidLine))
+            painter.drawRect(boundry)
+            painter.setPen(QPen(option.palette.windowText(), 0, Qt.DashLine))
+            painter.drawRect(boundry)
+
     def draw_square(self, painter: QPainter) -> None:
         brush = QBrush()
         # background
         brush.setStyle(Qt.SolidPattern)
-        brush.setColor(self._model["bgColor"])
+        brush.setColor(self._data.bgColor)
         painter.setBrush(brush)
         painter.drawRect(self.boundingRect())
 
         # Highlighted
         painter.setPen(Qt.NoPen)
-        if self._highlight:
+        if self._data.highlight:
             brush.setStyle(Qt.SolidPattern)
             # brush.setColor(QColor(192,255,0))
             brush.setColor(QColor(255, 0, 0))
@@ -156,151 +327,107 @@ class PickNode(QGraphicsTextItem):
         painter.drawRect(boundry)
 
     def draw_circle(self, painter: QPainter) -> None:
-        brush = QBrush()
-        # Highlighted
-        painter.setPen(Qt.NoPen)
-        if self._highlight:
-            brush.setStyle(Qt.SolidPattern)
-            brush.setColor(QColor(255, 0, 0))
-        else:
-            brush.setStyle(Qt.SolidPattern)
-            brush.setColor(QColor(224, 224, 224))
-        boundry = self.boundingRect()
-        painter.setBrush(brush)
-        painter.drawEllipse(boundry)
-
-        # background
-        brush.setColor(self._model["bgColor"])
-        painter.setBrush(brush)
-        boundry = self.boundingRect()
-        offset = 2
-        painter.drawEllipse(boundry.x() + offset, boundry.y() + offset, boundry.width() - (offset * 2),
-                            boundry.height() - (offset * 2))
+        self.draw_outline(painter, 2)
 
     def draw_triangle(self, painter=QPainter) -> None:
-        brush = QBrush()
-        # Highlighted
-        painter.setPen(Qt.NoPen)
-        if self._highlight:
-            brush.setStyle(Qt.SolidPattern)
-            brush.setColor(QColor(255, 0, 0))
-        else:
-            brush.setStyle(Qt.SolidPattern)
-            brush.setColor(QColor(224, 224, 224))
-        boundry = self.boundingRect()
-        painter.setBrush(brush)
-        path = QPainterPath()
-        p1 = QPointF(boundry.center().x(), 0)
-        p2 = QPointF(boundry.width(), boundry.height())
-        p3 = QPointF(0, boundry.height())
-        path.moveTo(p1)
-        path.lineTo(p2)
-        path.lineTo(p3)
-        path.lineTo(p1)
-        painter.drawPath(path)
-
-        # background
-        brush.setColor(self._model["bgColor"])
-        painter.setBrush(brush)
-        percentage = 8
-        wOffset = (percentage * boundry.width()) / 100
-        hOffset = (percentage * boundry.height()) / 100
-        path = QPainterPath()
-        p1 = QPointF(boundry.center().x(), hOffset)
-        p2 = QPointF(boundry.width() - wOffset, boundry.height() - hOffset)
-        p3 = QPointF(wOffset, boundry.height() - hOffset)
-        path.moveTo(p1)
-        path.lineTo(p2)
-        path.lineTo(p3)
-        path.lineTo(p1)
-        painter.drawPath(path)
+        self.draw_outline(painter, 8)
 
     def draw_plus(self, painter: QPainter) -> None:
-        brush = QBrush()
+        self.draw_outline(painter, 4)
+
+    def draw_outline(self, painter: QPainter, inset: float) -> None:
+        """
+        Draw the highlight outline of the shape and its background inside.
+
+        Parameters
+        ----------
+        painter: (QPainter)
+            Painter of the node.
+        inset: (float)
+            Width of the highlight outline, see shape_path.
+        """
+        boundry = self.boundingRect()
+        shape = self._data.shape
         # Highlighted
         painter.setPen(Qt.NoPen)
-        if self._highlight:
-            brush.setStyle(Qt.SolidPattern)
-            brush.setColor(QColor(255, 0, 0))
-        else:
-            brush.setStyle(Qt.SolidPattern)
-            brush.setColor(QColor(224, 224, 224))
-        boundry = self.boundingRect()
-        painter.setBrush(brush)
-        path = QPainterPath()
-        widthSec = boundry.width() / 3
-        heightSec = boundry.height() / 3
-        path.moveTo(widthSec, 0)
-        path.lineTo(widthSec * 2, 0)
-        path.lineTo(widthSec * 2, heightSec)
-        path.lineTo(widthSec * 3, heightSec)
-        path.lineTo(widthSec * 3, heightSec * 2)
-        path.lineTo(widthSec * 2, heightSec * 2)
-        path.lineTo(widthSec * 2, heightSec * 3)
-        path.lineTo(widthSec, heightSec * 3)
-        path.lineTo(widthSec, heightSec * 2)
-        path.lineTo(0, heightSec * 2)
-        path.lineTo(0, heightSec)
-        path.lineTo(widthSec, heightSec)
-        path.lineTo(widthSec, 0)
-        painter.drawPath(path)
+        painter.setBrush(QColor(255, 0, 0) if self._data.highlight else QColor(224, 224, 224))
+        painter.drawPath(shape_path(shape, boundry.width(), boundry.height()))
 
         # background
-        brush.setColor(self._model["bgColor"])
-        painter.setBrush(brush)
-        offset = 4
-        path = QPainterPath()
-        widthSec = boundry.width() / 3
-        heightSec = boundry.height() / 3
-        path.moveTo(widthSec + offset, 0 + offset)
-        path.lineTo((widthSec * 2) - offset, 0 + offset)
-        path.lineTo((widthSec * 2) - offset, heightSec + offset)
-        path.lineTo((widthSec * 3) - offset, heightSec + offset)
-        path.lineTo((widthSec * 3) - offset, (heightSec * 2) - offset)
-        path.lineTo((widthSec * 2) - offset, (heightSec * 2) - offset)
-        path.lineTo((widthSec * 2) - offset, (heightSec * 3) - offset)
-        path.lineTo(widthSec + offset, (heightSec * 3) - offset)
-        path.lineTo(widthSec + offset, (heightSec * 2) - offset)
-        path.lineTo(0 + offset, (heightSec * 2) - offset)
-        path.lineTo(0 + offset, heightSec + offset)
-        path.lineTo(widthSec + offset, heightSec + offset)
-        path.lineTo(widthSec + offset, 0 + offset)
-        painter.drawPath(path)
+        painter.setBrush(self._data.bgColor)
+        painter.drawPath(shape_path(shape, boundry.width(), boundry.height(), inset))
+
+    def shape(self) -> QPainterPath:
+        boundry = self.boundingRect()
+        return shape_path(self._data.shape, boundry.width(), boundry.height())
 
     def text_edit(self) -> None:
-        self.setFlag(QGraphicsItem.ItemIsMovable, False)
-        self.setTextInteractionFlags(Qt.TextEditorInteraction)
-        self.setFocus(Qt.MouseFocusReason)
+        """
+        Edit the text in place, the text document only exists while editing.
+        """
+        if self._editor is None:
+            self._editor = PickTextEditor(self)
+            self._editor.setFont(self._data.font)
+            self._editor.setDefaultTextColor(self._data.textColor)
+            self._editor.setPlainText(self._data.text)
+            self._editor.setTextInteractionFlags(Qt.TextEditorInteraction)
+            self._editor.document().contentsChanged.connect(self.text_changed)
+            self._editor.onEditingFinished.connect(self.text_edit_finished)
+            self._movable = bool(self.flags() & QGraphicsItem.ItemIsMovable)
+            self.setFlag(QGraphicsItem.ItemIsMovable, False)
+            self.update()
+        self._editor.setFocus(Qt.MouseFocusReason)
         self.setSelected(True)
-        self.setFlag(QGraphicsItem.ItemIgnoresTransformations)
         self.text_highlight()
 
+    def text_changed(self) -> None:
+        self.setPlainText(self._editor.toPlainText())
+
+    def text_edit_finished(self) -> None:
+        """
+        Remove the text editor and draw the text again.
+        """
+        editor = self._editor
+        if editor is None:
+            return
+        # removing the editor takes its focus away and finishes again
+        self._editor = None
+        self.setFlag(QGraphicsItem.ItemIsMovable, self._movable)
+        if self.scene():
+            self.scene().removeItem(editor)
+        editor.deleteLater()
+        self.update()
+
     def text_highlight(self) -> None:
-        cursor = self.textCursor()
-        cursor.setPosition(QTextCursor.Start, QTextCursor.MoveAnchor)
-        cursor.setPosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        if self._editor is None:
+            return
+        cursor = self._editor.textCursor()
+        cursor.movePosition(QTextCursor.Start, QTextCursor.MoveAnchor)
+        cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
         cursor.select(QTextCursor.LineUnderCursor)
         cursor.atEnd()
-        self.setTextCursor(cursor)
+        self._editor.setTextCursor(cursor)
 
     def clear_highlight(self) -> None:
-        cursor = self.textCursor()
+        if self._editor is None:
+            return
+        cursor = self._editor.textCursor()
         cursor.clearSelection()
-        self.setTextCursor(cursor)
+        self._editor.setTextCursor(cursor)
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any) -> Any:
-        if change == QGraphicsItem.ItemSelectedChange and value:
-            self.onSelected.emit(self.get_items())
-            self.onAddToStack.emit()
-        elif value == 0:
-            self.onRemoveFromStack.emit()
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self.onGeometryChanged.emit(self)
         return super().itemChange(change, value)
 
+    def geometry_changed(self, *args) -> None:
+        self.onGeometryChanged.emit(self)
+
     def get_highlight(self) -> bool:
-        return self._highlight
+        return self._data.highlight
 
     def set_highlight(self, value: bool) -> None:
-        self._highlight = value
+        self._data.highlight = value
         self.update()
 
     Highlight = property(get_highlight, set_highlight)
@@ -308,11 +435,15 @@ class PickNode(QGraphicsTextItem):
 
 class ButtonNode(QGraphicsTextItem):
     onClicked = Signal(str, str)
-    onSelected = Signal()
+    onGeometryChanged = Signal(object)
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.setAcceptHoverEvents(True)
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+        # repaint from a pixmap until hover, press or a setter calls update()
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.document().documentLayout().documentSizeChanged.connect(self.geometry_changed)
         self.init()
 
         self.isPressed = False
@@ -321,18 +452,20 @@ class ButtonNode(QGraphicsTextItem):
 
     def init(self) -> None:
         self._model = {
-            'bgColor': QColor(178, 34, 34),
+            'bgColor': get_color((178, 34, 34)),
             'command': "",
-            'commandsType': CommandType.PYTHON,
-            'id': str(uuid4())
+            'commandsType': CommandType.PYTHON
         }
+        # globals and timing of the command, reset when the command changes
+        self._scope = {}
+        self._stats = CommandStats()
         self.update_tooltip()
 
     def get_brush(self) -> QColor:
         return self._model["bgColor"]
 
     def set_brush(self, value: QColor) -> None:
-        self._model["bgColor"] = QColor(value)
+        self._model["bgColor"] = get_color(value)
         self.update()
 
     Background = property(get_brush, set_brush)
@@ -341,10 +474,43 @@ class ButtonNode(QGraphicsTextItem):
         return self._model["command"]
 
     def set_command(self, cmd: str) -> None:
-        self._model["command"] = cmd
+        if cmd != self._model["command"]:
+            self._model["command"] = cmd
+            self._scope = {}
+            self._stats.reset()
+            self.update_tooltip()
 
     Command = property(get_command, set_command)
 
+    def get_scope(self) -> dict:
+        """
+        Get the globals of the Python command, kept between its runs.
+        """
+        return self._scope
+
+    Scope = property(get_scope)
+
+    def get_stats(self) -> CommandStats:
+        """
+        Get the execution time of the command runs.
+        """
+        return self._stats
+
+    Stats = property(get_stats)
+
+    def record_run(self, seconds: float, success: bool = True) -> None:
+        """
+        Record a run of the command.
+
+        :param seconds: Execution time of the run.
+        :param success: False if the command failed.
+        """
+        if success:
+            self._stats.add(seconds)
+        else:
+            self._stats.errors += 1
+        self.update_tooltip()
+
     def get_commandsType(self) -> CommandType:
         return self._model["commandsType"]
 
@@ -355,7 +521,10 @@ class ButtonNode(QGraphicsTextItem):
     CommandsType = property(get_commandsType, set_commandsType)
 
     def update_tooltip(self) -> None:
-        self.setToolTip(self._model["command"])
+        if self._stats.runs:
+            self.setToolTip("{}\n\n{}".format(self._model["command"].rstrip(), self._stats))
+        else:
+            self.setToolTip(self._model["command"])
 
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget) -> None:
         corners = 5
@@ -405,10 +574,13 @@ class ButtonNode(QGraphicsTextItem):
         super().paint(painter, option, widget)
 
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemSelectedChange and value:
-            self.onSelected.emit()
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self.onGeometryChanged.emit(self)
         return super().itemChange(change, value)
 
+    def geometry_changed(self, *args) -> None:
+        self.onGeometryChanged.emit(self)
+
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         super().mousePressEvent(event)
         if event.button() == Qt.LeftButton:
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Set, Any
+
+
+class SelectionIndex:
+    """
+    Inverted index of Maya object names to the nodes that select them.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[str, Set[Any]] = {}
+
+    def add(self, node: Any, names: Iterable[str]) -> None:
+        """
+        Register the node under each of the object names.
+
+        :param node: Reference to the node.
+        :param names: List of Maya object names the node selects.
+        """
+        for name in names:
+            self._index.setdefault(name, set()).add(node)
+
+    def remove(self, node: Any, names: Iterable[str]) -> None:
+        """
+        Unregister the node from each of the object names.
+
+        :param node: Reference to the node.
+        :param names: List of Maya object names the node selected.
+        """
+        for name in names:
+            nodes = self._index.get(name)
+            if nodes is not None:
+                nodes.discard(node)
+                if not nodes:
+                    del self._index[name]
+
+    def update(self, node: Any, oldNames: Iterable[str], newNames: Iterable[str]) -> None:
+        """
+        Move the node from the old object names to the new ones.
+
+        :param node: Reference to the node.
+        :param oldNames: Previous list of Maya object names.
+        :param newNames: Current list of Maya object names.
+        """
+        self.remove(node, oldNames)
+        self.add(node, newNames)
+
+    def nodes(self, names: Iterable[str]) -> Set[Any]:
+        """
+        Get all the nodes selecting any of the object names.
+
+        :param names: List of Maya object names.
+
+        :return: Set of nodes.
+        """
+        result = set()
+        for name in names:
+            nodes = self._index.get(name)
+            if nodes:
+                result.update(nodes)
+        return result
+
+    def clear(self) -> None:
+        """ Remove every entry from the index. """
+        self._index.clear()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class SelectionStack:
+    """
+    Insertion ordered set of the selected nodes, with the Maya object names
+    they select counted so the outgoing selection is kept without duplicates.
+    Names keep the position of the first node that selected them.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[Any, List[str]] = OrderedDict()
+        self._names: Dict[str, int] = OrderedDict()
+        # the names are put back in the order of the nodes by the next names()
+        self._reorder = False
+
+    def add(self, node: Any, names: Iterable[str]) -> None:
+        """
+        Push the node on top of the stack.
+
+        :param node: Reference to the node.
+        :param names: List of Maya object names the node selects.
+        """
+        if node in self._nodes:
+            return
+        names = list(names)
+        self._nodes[node] = names
+        self._add_names(names)
+
+    def remove(self, node: Any) -> None:
+        """
+        Remove the node from the stack.
+
+        :param node: Reference to the node.
+        """
+        names = self._nodes.pop(node, None)
+        if names is not None:
+            self._remove_names(names)
+
+    def update(self, node: Any, names: Iterable[str]) -> None:
+        """
+        Replace the object names of a node in the stack, keeping its position.
+
+        :param node: Reference to the node.
+        :param names: Current list of Maya object names.
+        """
+        if node in self._nodes:
+            names = list(names)
+            self._remove_names(self._nodes[node])
+            self._nodes[node] = names
+            self._add_names(names)
+            # the new names were added at the end, not at the position of the node
+            self._reorder = True
+
+    def names(self) -> List[str]:
+        """
+        Get the object names of all the nodes in the stack.
+
+        :return: List of unique Maya object names, in selection order.
+        """
+        if self._reorder:
+            self._names = OrderedDict((name, self._names[name]) for names in self._nodes.values() for name in names)
+            self._reorder = False
+        return list(self._names)
+
+    def last(self) -> Any:
+        """
+        Get the node on top of the stack.
+
+        :return: Reference to the node, None if the stack is empty.
+        """
+        return next(reversed(self._nodes), None)
+
+    def clear(self) -> None:
+        """ Remove every node from the stack. """
+        self._nodes.clear()
+        self._names.clear()
+        self._reorder = False
+
+    def _add_names(self, names: List[str]) -> None:
+        for name in names:
+            self._names[name] = self._names.get(name, 0) + 1
+
+    def _remove_names(self, names: List[str]) -> None:
+        for name in names:
+            count = self._names[name] - 1
+            if count:
+                self._names[name] = count
+            else:
+                del self._names[name]
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._nodes
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
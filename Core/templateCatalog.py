@@ -0,0 +1,187 @@
+import base64
+import os
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+from PuppetMaster.Core.PySideLibrary.QtCore import QBuffer, QByteArray, QSize, Qt
+from PuppetMaster.Core.PySideLibrary.QtGui import QImage, QImageReader
+
+from PuppetMaster.Core.qnodes import PII, PIIPick, PIINode
+from PuppetMaster.Core.piiFile import read_pii, decode_pii, decode_pii_async, run_async, VERSION_1
+from PuppetMaster.Core.namespaceRegistry import NamespaceRegistry
+
+THUMBNAIL_SIZE = QSize(96, 54)
+
+_catalog: Optional["TemplateCatalog"] = None
+
+
+class TemplateInfo():
+    """
+    Lightweight description of a template file.
+    """
+    __slots__ = ('path', 'size', 'mtime', 'nodeCount', 'namespaces', 'thumbnail')
+
+    def __init__(self, path: str, size: int, mtime: int) -> None:
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.nodeCount = 0
+        self.namespaces = []
+        self.thumbnail = QImage()
+
+    def key(self) -> Tuple[str, int, int]:
+        return self.path, self.size, self.mtime
+
+
+def read_template_info(path: str, size: int, mtime: int) -> TemplateInfo:
+    """
+    Read the metadata of a template, safe to run outside the GUI thread.
+
+    Parameters
+    ----------
+    path: (str)
+        Path of .PII file.
+    size: (int)
+        Size of the file in bytes.
+    mtime: (int)
+        Modification time of the file in nanoseconds.
+
+    Return
+    ------
+    out: (TemplateInfo)
+        Node count, namespaces and background thumbnail of the template.
+    """
+    info = TemplateInfo(path, size, mtime)
+    data = read_pii(path)
+    nodes = data.get(PII.NODES, [])
+    namespaces = NamespaceRegistry()
+    for each in nodes:
+        if each.get(PIIPick.TYPE) == PIINode.PICK:
+            namespaces.add(each.get(PIIPick.SELECTION, []))
+    info.nodeCount = len(nodes)
+    info.namespaces = namespaces.namespaces()
+    background = data.get(PII.BACKGROUND)
+    if background:
+        if data[PII.VERSION] == VERSION_1:
+            background = base64.b64decode(background)
+        buffer = QBuffer()
+        buffer.setData(QByteArray(background))
+        reader = QImageReader(buffer)
+        # decoders like JPEG scale while decoding, far cheaper than the full image
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(THUMBNAIL_SIZE, Qt.KeepAspectRatio))
+        info.thumbnail = reader.read()
+    return info
+
+
+class TemplateCatalog:
+    """
+    Session cache of the templates metadata, keyed by path, size and mtime.
+    Metadata is read on the worker threads, and the chosen template is
+    decoded ahead of its use.
+    """
+
+    def __init__(self) -> None:
+        self._infos: Dict[str, TemplateInfo] = {}
+        self._pending: Dict[str, Future] = {}
+        self._prefetch: Optional[Tuple[Tuple[str, int, int], Future]] = None
+
+    def list_templates(self, directory: str) -> List[Tuple[str, str, int, int]]:
+        """
+        List the template files of a directory.
+
+        :param directory: Templates directory.
+
+        :return: List of (file name, path, size, mtime) sorted by file name.
+        """
+        templates = []
+        if os.path.isdir(directory):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith(".pii") and entry.is_file():
+                        stat = entry.stat()
+                        templates.append((entry.name, entry.path, stat.st_size, stat.st_mtime_ns))
+        templates.sort()
+        return templates
+
+    def get_info(self, path: str, size: int, mtime: int) -> Optional[TemplateInfo]:
+        """
+        Get the metadata of a template, reading it in the background when it isn't cached.
+
+        :param path: Path of .PII file.
+        :param size: Size of the file in bytes.
+        :param mtime: Modification time of the file in nanoseconds.
+
+        :return: Metadata of the template, None until it's read.
+        """
+        info = self._infos.get(path)
+        if info is not None and info.key() == (path, size, mtime):
+            return info
+        if path not in self._pending:
+            self._pending[path] = run_async(read_template_info, path, size, mtime)
+        return None
+
+    def is_pending(self) -> bool:
+        """ Check if any metadata is being read. """
+        return bool(self._pending)
+
+    def poll(self) -> List[TemplateInfo]:
+        """
+        Collect the metadata read in the background.
+
+        :return: List of the metadata finished since the last call.
+        """
+        finished = []
+        for path, future in list(self._pending.items()):
+            if future.done():
+                del self._pending[path]
+                try:
+                    info = future.result()
+                except Exception:
+                    # broken template, it's reported when it's chosen
+                    continue
+                self._infos[path] = info
+                finished.append(info)
+        return finished
+
+    def prefetch(self, path: str) -> None:
+        """
+        Start decoding a template on a worker thread.
+
+        :param path: Path of .PII file.
+        """
+        key = self._file_key(path)
+        if key is not None and (self._prefetch is None or self._prefetch[0] != key):
+            self._prefetch = (key, decode_pii_async(path))
+
+    def load(self, path: str) -> dict:
+        """
+        Get the decoded template, from the prefetch when it's still up to date.
+
+        :param path: Path of .PII file.
+
+        :return: Dictionary of scene data, see decode_pii.
+        """
+        prefetch = self._prefetch
+        self._prefetch = None
+        if prefetch is not None and prefetch[0] == self._file_key(path):
+            return prefetch[1].result()
+        return decode_pii(path)
+
+    @staticmethod
+    def _file_key(path: str) -> Optional[Tuple[str, int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return path, stat.st_size, stat.st_mtime_ns
+
+
+def get_template_catalog() -> TemplateCatalog:
+    """
+    Get the template catalog, kept for the whole session.
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = TemplateCatalog()
+    return _catalog
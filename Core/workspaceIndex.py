@@ -0,0 +1,125 @@
+import os
+import re
+from typing import Dict, List, Optional
+
+# "hero_v012", "hero.12", "hero-v3" are versions of the "hero" picker, a version
+# needs a separator so names like "dev12" or "rev3" are kept whole
+VERSION_PATTERN = re.compile(r"^(?P<name>.+?)[_.\-]v?\d+$", re.IGNORECASE)
+DIGITS = re.compile(r"(\d+)")
+
+_indexes: Dict[str, "WorkspaceIndex"] = {}
+
+
+def natural_key(text: str) -> list:
+    """
+    Get the sort key of a text with its numbers compared by value, so v10 comes after v9.
+
+    :param text: Text to sort.
+    """
+    return [int(part) if part.isdigit() else part.lower() for part in DIGITS.split(text)]
+
+
+def picker_name(fileName: str) -> str:
+    """
+    Get the picker name of a .pii file name, without extension and version.
+
+    :param fileName: Name of the .pii file.
+    """
+    stem = os.path.splitext(fileName)[0]
+    match = VERSION_PATTERN.match(stem)
+    return match.group("name") if match else stem
+
+
+class WorkspaceIndex:
+    """
+    Index of the .pii files of a directory by picker name, each with its
+    versions in order. The directory is scanned again when its mtime changes.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Directory of the .pii files.
+        """
+        self.path = path
+        self._mtime = None
+        self._files: List[str] = []
+        self._pickers: Dict[str, List[str]] = {}
+
+    def refresh(self) -> bool:
+        """
+        Scan the directory if it changed since the last scan.
+
+        :return: True if the directory was scanned, otherwise False.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime and self._mtime is not None:
+            return False
+        files = []
+        if mtime is not None:
+            with os.scandir(self.path) as entries:
+                files = [entry.name for entry in entries
+                         if entry.name.lower().endswith(".pii") and entry.is_file()]
+        files.sort(key=natural_key)
+        pickers = {}
+        for fileName in files:
+            pickers.setdefault(picker_name(fileName), []).append(fileName)
+        self._mtime = mtime
+        self._files = files
+        self._pickers = pickers
+        return True
+
+    def versions(self, name: str) -> List[str]:
+        """
+        Get the files of a picker.
+
+        :param name: Picker name.
+
+        :return: List of file names, from the oldest version to the latest.
+        """
+        self.refresh()
+        return list(self._pickers.get(name, []))
+
+    def resolve(self, names: List[str]) -> List[Optional[str]]:
+        """
+        Find the latest file of each name. Names which aren't a picker name are
+        looked up as part of the file names, in one pass over the files.
+
+        :param names: List of picker names.
+
+        :return: List of file paths, None for the names without a file.
+        """
+        self.refresh()
+        result = {}
+        missing = set()
+        for name in names:
+            versions = self._pickers.get(name)
+            if versions:
+                result[name] = versions[-1]
+            else:
+                missing.add(name)
+        if missing:
+            # files are in natural order, the last match is the latest
+            for fileName in self._files:
+                for name in missing:
+                    if name in fileName:
+                        result[name] = fileName
+        return [os.path.join(self.path, result[name]) if name in result else None for name in names]
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._files)
+
+
+def get_workspace_index(path: str) -> WorkspaceIndex:
+    """
+    Get the index of a directory, kept for the whole session.
+
+    :param path: Directory of the .pii files.
+    """
+    index = _indexes.get(path)
+    if index is None:
+        index = _indexes[path] = WorkspaceIndex(path)
+    return index
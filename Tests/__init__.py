@@ -0,0 +1,11 @@
+"""
+Tests running outside Maya, with the FakeBackend or Benchmarks.mayaStub in
+place of the host application.
+
+Usage, from the directory holding the PuppetMaster package:
+    python -m pytest PuppetMaster/Tests
+or  python -m unittest discover -s PuppetMaster/Tests -t .
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -0,0 +1,108 @@
+import unittest
+
+from PuppetMaster.Core.PySideLibrary.QtWidgets import *
+from PuppetMaster.Core.PySideLibrary.QtCore import *
+from PuppetMaster.Core.PySideLibrary.QtGui import *
+from PuppetMaster.Core.dccBackend import FakeBackend, set_backend
+from PuppetMaster.Core.commandRunner import get_command_runner
+from PuppetMaster.Core.qnodes import ButtonNode
+from PuppetMaster.UI.QCanvas import CanvasGraphicsView
+
+
+class CanvasSelectionTest(unittest.TestCase):
+    """
+    Maya selection pushed by the mouse clicks of the canvas.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self.backend = FakeBackend()
+        set_backend(self.backend)
+        self.canvas = CanvasGraphicsView()
+        self.canvas.resize(800, 600)
+        self.canvas.show()
+        self.canvas.Edit = False
+        black, white = QColor(0, 0, 0), QColor(255, 255, 255)
+        self.picker = self.canvas.create_node(QPointF(300, 0), "  ", 10, black, white, ["ctrl_a"])
+        self.canvas.create_button(QPointF(0, 0), "Key", 10, black, white, "seen.append(cmds.ls(sl=True))", "python")
+        self.canvas.create_button(QPointF(0, 100), "Key2", 10, black, white, "seen.append(cmds.ls(sl=True))", "python")
+        self.seen = []
+        self.buttons = sorted((item for item in self.canvas.scene().items() if type(item) == ButtonNode),
+                              key=lambda item: item.y())
+        for button in self.buttons:
+            button.Scope.update(seen=self.seen)
+        self.app.processEvents()
+        self.backend.set_selection(["a"])
+        del self.backend.calls[:]
+
+    def tearDown(self) -> None:
+        get_command_runner().flush()
+        self.canvas.close()
+        self.canvas.deleteLater()
+        self.app.processEvents()
+        set_backend(None)
+
+    def send(self, eventType: QEvent.Type, pos: QPoint, buttons: Qt.MouseButton,
+             modifiers: Qt.KeyboardModifier = Qt.NoModifier) -> None:
+        viewport = self.canvas.viewport()
+        QApplication.sendEvent(viewport, QMouseEvent(eventType, QPointF(pos), QPointF(viewport.mapToGlobal(pos)),
+                                                     Qt.LeftButton, buttons, modifiers))
+
+    def click(self, item: QGraphicsItem, modifiers: Qt.KeyboardModifier = Qt.NoModifier) -> None:
+        pos = self.canvas.mapFromScene(item.sceneBoundingRect().center())
+        self.send(QEvent.MouseButtonPress, pos, Qt.LeftButton, modifiers)
+        self.send(QEvent.MouseButtonRelease, pos, Qt.NoButton, modifiers)
+        get_command_runner().flush()
+
+    def select_calls(self) -> list:
+        return [call for call in self.backend.calls if call[0] == "select"]
+
+    def test_button_keeps_selection(self) -> None:
+        self.click(self.buttons[0])
+        self.assertEqual(self.seen, [["a"]])
+        self.assertEqual(self.backend.selection, ["a"])
+        self.assertEqual(self.select_calls(), [])
+
+    def test_picker_replaces_selection(self) -> None:
+        self.click(self.picker)
+        self.assertEqual(self.backend.selection, ["ctrl_a"])
+
+    def test_macro_mode(self) -> None:
+        self.canvas.macroMode = True
+        self.click(self.buttons[0])
+        self.click(self.buttons[1], Qt.ControlModifier)
+        self.assertEqual(self.seen, [])
+        self.assertEqual(self.backend.selection, ["a"])
+        self.assertEqual(self.canvas.get_macro_buttons(), self.buttons)
+        # the controls of the macro are still picked from the canvas
+        self.click(self.picker)
+        self.assertEqual(self.backend.selection, ["ctrl_a"])
+        self.canvas.run_macro(self.buttons)
+        self.assertEqual(self.seen, [["ctrl_a"], ["ctrl_a"]])
+
+    def test_rubber_band_over_buttons(self) -> None:
+        rect = self.canvas.mapFromScene(self.buttons[0].sceneBoundingRect().united(
+            self.buttons[1].sceneBoundingRect())).boundingRect().adjusted(-5, -5, 5, 5)
+        self.send(QEvent.MouseButtonPress, rect.topLeft(), Qt.LeftButton)
+        self.send(QEvent.MouseMove, rect.center(), Qt.LeftButton)
+        self.send(QEvent.MouseMove, rect.bottomRight(), Qt.LeftButton)
+        self.send(QEvent.MouseButtonRelease, rect.bottomRight(), Qt.NoButton)
+        self.assertEqual(len(self.canvas.scene().selectedItems()), 2)
+        self.assertEqual(self.backend.selection, ["a"])
+
+    def test_namespace_keeps_selection_order(self) -> None:
+        black, white = QColor(0, 0, 0), QColor(255, 255, 255)
+        pickers = [self.canvas.create_node(QPointF(300, 100 * index), "  ", 10, black, white, [name])
+                   for index, name in enumerate(("char:a", "char:b", "char:sub:c"), 1)]
+        for picker in pickers:
+            picker.setSelected(True)
+        self.canvas.set_namespace({"char": "hero"})
+        self.canvas.update_maya_selection()
+        self.assertEqual(self.backend.selection, ["hero:a", "hero:b", "hero:sub:c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
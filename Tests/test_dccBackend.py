@@ -0,0 +1,77 @@
+import unittest
+
+from PuppetMaster.Core.PySideLibrary.QtWidgets import QApplication
+from PuppetMaster.Core.dccBackend import FakeBackend, set_backend
+from PuppetMaster.Core.mayaHelper import execPython, replaceSelection, getActiveItems
+from PuppetMaster.Core.commandRunner import CommandRunner
+
+
+class FakeBackendTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.backend = FakeBackend(namespaces=["hero"])
+        set_backend(self.backend)
+
+    def tearDown(self) -> None:
+        set_backend(None)
+
+    def test_replace_selection(self) -> None:
+        self.backend.set_selection(["a"])
+        replaceSelection(["b", "c"])
+        self.assertEqual(getActiveItems(), ["b", "c"])
+        replaceSelection([])
+        self.assertEqual(getActiveItems(), [])
+        self.assertEqual([call for call in self.backend.calls if call[0] == "select"],
+                         [("select", ["b", "c"], False), ("select", [], False)])
+
+    def test_selection_callback(self) -> None:
+        events = []
+        callbackId = self.backend.add_selection_callback(lambda: events.append(self.backend.selection))
+        replaceSelection(["a"])
+        self.backend.remove_callback(callbackId)
+        replaceSelection(["b"])
+        self.assertEqual(events, [["a"]])
+
+    def test_python_command_cmds(self) -> None:
+        self.backend.set_selection(["a"])
+        scope = {}
+        execPython("cmds.select('b', add=True)\n"
+                   "found = cmds.ls(selection=True)\n"
+                   "cmds.setKeyframe(found)\n"
+                   "mel.eval('print 1')", scope)
+        self.assertEqual(scope["found"], ["a", "b"])
+        self.assertIn(("cmds.setKeyframe", (["a", "b"],), {}), self.backend.calls)
+        self.assertIn(("run_mel", "print 1"), self.backend.calls)
+
+    def test_python_command_scope(self) -> None:
+        scope = {}
+        execPython("count = globals().get('count', 0) + 1", scope)
+        execPython("count = globals().get('count', 0) + 1", scope)
+        self.assertEqual(scope["count"], 2)
+        self.assertIn("QMessageBox", scope)
+
+    def test_runner_batch(self) -> None:
+        app = QApplication.instance() or QApplication([])
+        runner = CommandRunner()
+        runner.dedupeInterval = 0
+        errors = []
+        runner.onLog.connect(lambda level, message: errors.append(message))
+        self.backend.set_selection(["a"])
+        self.assertTrue(runner.submit("python", "cmds.select(cmds.ls(sl=True) + ['b'])"))
+        self.assertTrue(runner.submit("python", "1/0"))
+        self.assertTrue(runner.submit("mel", "print 1"))
+        with self.backend.batch("macro"):
+            runner.flush()
+        self.assertFalse(runner.is_pending())
+        self.assertEqual(self.backend.selection, ["a", "b"])
+        self.assertEqual(len(errors), 1)
+        self.assertIn("ZeroDivisionError", errors[0])
+        self.assertEqual(runner.get_stats()['ran'], 3)
+        self.assertEqual(self.backend.calls[0], ("open_undo_chunk", "macro"))
+        self.assertEqual(self.backend.calls[-1], ("close_undo_chunk",))
+        runner.deleteLater()
+        app.processEvents()
+
+
+if __name__ == '__main__':
+    unittest.main()
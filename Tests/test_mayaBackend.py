@@ -0,0 +1,87 @@
+import unittest
+
+from PuppetMaster.Core.PySideLibrary.QtWidgets import *
+from PuppetMaster.Core.PySideLibrary.QtCore import *
+from PuppetMaster.Core.PySideLibrary.QtGui import *
+from PuppetMaster.Benchmarks import mayaStub
+from PuppetMaster.Core.dccBackend import MayaBackend, set_backend
+from PuppetMaster.Core.mayaHelper import execPython, replaceSelection, getActiveItems
+from PuppetMaster.UI.CustomeTabWidget import CanvasGraphicsViewTab
+
+
+class MayaBackendTest(unittest.TestCase):
+    """
+    Maya backend calls, made on Benchmarks.mayaStub.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        if not mayaStub.install():
+            raise unittest.SkipTest("the real Maya is installed")
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self.backend = MayaBackend()
+        set_backend(self.backend)
+        mayaStub.reset()
+
+    def tearDown(self) -> None:
+        set_backend(None)
+
+    def select_calls(self) -> list:
+        return [call for call in mayaStub.calls if call[0] == "select"]
+
+    def test_replace_selection(self) -> None:
+        replaceSelection(["a"])
+        replaceSelection(["b", "c"])
+        self.assertEqual(getActiveItems(), ["b", "c"])
+        replaceSelection([])
+        self.assertEqual(getActiveItems(), [])
+        # a single select per change, never a clear before adding
+        self.assertEqual(self.select_calls(), [("select", (["a"],), {"replace": True}),
+                                               ("select", (["b", "c"],), {"replace": True}),
+                                               ("select", (), {"clear": True})])
+
+    def test_selection_callback(self) -> None:
+        events = []
+        callbackId = self.backend.add_selection_callback(lambda: events.append(getActiveItems()))
+        replaceSelection(["a"])
+        self.backend.remove_callback(callbackId)
+        replaceSelection(["b"])
+        self.assertEqual(events, [["a"]])
+
+    def test_python_command(self) -> None:
+        scope = {}
+        execPython("cmds.select('a')\n"
+                   "pm.select('b', add=True)\n"
+                   "found = cmds.ls(selection=True)\n"
+                   "mel.eval('print 1')", scope)
+        self.assertEqual(scope["found"], ["a", "b"])
+        self.assertIn(("mel", ("print 1",), {}), mayaStub.calls)
+
+    def test_selection_echo(self) -> None:
+        tab = CanvasGraphicsViewTab()
+        callbackId = self.backend.add_selection_callback(tab.maya_selection)
+        canvas = tab.load_tab("picker", {})
+        picker = canvas.create_node(QPointF(0, 0), "  ", 10, QColor(0, 0, 0), QColor(255, 255, 255), ["a"])
+        picker.setSelected(True)
+
+        # the selection pushed by the canvas doesn't schedule a highlight pass
+        canvas.update_maya_selection()
+        self.app.processEvents()
+        self.assertEqual(tab.get_selection_stats(), {'events': 1, 'passes': 0, 'skipped': 0, 'suppressed': 1})
+        self.assertEqual(canvas.Highlight, ["a"])
+
+        # a selection made in Maya does
+        replaceSelection([])
+        self.app.processEvents()
+        self.assertEqual(tab.get_selection_stats(), {'events': 2, 'passes': 1, 'skipped': 0, 'suppressed': 1})
+        self.assertEqual(canvas.Highlight, [])
+
+        self.backend.remove_callback(callbackId)
+        tab.deleteLater()
+        self.app.processEvents()
+
+
+if __name__ == '__main__':
+    unittest.main()
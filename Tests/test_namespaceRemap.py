@@ -0,0 +1,33 @@
+import unittest
+
+from PuppetMaster.Core.namespaceRemap import NamespaceRemapper
+
+
+class NamespaceRemapperTest(unittest.TestCase):
+
+    def test_parent_renames_nested(self) -> None:
+        remapper = NamespaceRemapper({"crowd:char0": "shot010:char0", "crowd:char0:face": "crowd:char0:face",
+                                      "crowd": "crowd"})
+        self.assertEqual(remapper.names(["crowd:char0:ctrl", "crowd:char0:face:ctrl", "crowd:ctrl", "ctrl"]),
+                         ["shot010:char0:ctrl", "shot010:char0:face:ctrl", "crowd:ctrl", "ctrl"])
+
+    def test_longest_prefix(self) -> None:
+        remapper = NamespaceRemapper({"a": "x", "a:b": "y"})
+        self.assertEqual(remapper.names(["a:ctrl", "a:b:ctrl", "a:b:c:ctrl", "ab:ctrl"]),
+                         ["x:ctrl", "y:ctrl", "y:c:ctrl", "ab:ctrl"])
+
+    def test_no_cascade(self) -> None:
+        remapper = NamespaceRemapper({"b": "a", "a": "x"})
+        self.assertEqual(remapper.names(["a:ctrl", "b:ctrl"]), ["x:ctrl", "a:ctrl"])
+
+    def test_swap(self) -> None:
+        remapper = NamespaceRemapper({"hero": "villain", "villain": "hero"})
+        self.assertEqual(remapper.names(["hero:ctrl", "villain:sub:ctrl"]), ["villain:ctrl", "hero:sub:ctrl"])
+
+    def test_remove_namespace(self) -> None:
+        remapper = NamespaceRemapper({"char": ""})
+        self.assertEqual(remapper.names(["char:ctrl", "char:face:ctrl"]), ["ctrl", "face:ctrl"])
+
+
+if __name__ == '__main__':
+    unittest.main()
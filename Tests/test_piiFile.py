@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from PuppetMaster.Core.PySideLibrary.QtWidgets import *
+from PuppetMaster.Core.PySideLibrary.QtCore import *
+from PuppetMaster.Core.PySideLibrary.QtGui import *
+from PuppetMaster.Core.env_handler import PM_PII_VERSION
+from PuppetMaster.Core.dccBackend import FakeBackend, set_backend
+from PuppetMaster.Core.piiFile import VERSION_1, VERSION_2, decode_pii, write_pii
+from PuppetMaster.Core.qnodes import PII
+from PuppetMaster.UI.QCanvas import CanvasGraphicsView
+
+
+class PiiVersionTest(unittest.TestCase):
+    """
+    Version of the saved .pii files.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        set_backend(FakeBackend())
+        self._version = os.environ.pop(PM_PII_VERSION, None)
+        self.directory = tempfile.mkdtemp()
+        image = QImage(64, 32, QImage.Format_RGB32)
+        image.fill(QColor(40, 80, 120))
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        buffer.close()
+        self.canvas = CanvasGraphicsView()
+        self.canvas.set_background_data(bytes(data), "png")
+        self.canvas.create_node(QPointF(10, 10), "A", 10, QColor(0, 0, 0), QColor(255, 255, 255), ["char:ctrl"])
+
+    def tearDown(self) -> None:
+        if self._version is None:
+            os.environ.pop(PM_PII_VERSION, None)
+        else:
+            os.environ[PM_PII_VERSION] = self._version
+        self.canvas.deleteLater()
+        self.app.processEvents()
+        shutil.rmtree(self.directory)
+        set_backend(None)
+
+    def save_and_read(self) -> tuple:
+        path = os.path.join(self.directory, "picker.pii")
+        write_pii(path, self.canvas.get_raw())
+        return zipfile.is_zipfile(path), decode_pii(path)
+
+    def check_content(self, data: dict) -> None:
+        self.assertEqual(data[PII.IMAGE].size(), QSize(64, 32))
+        self.assertEqual(len(data[PII.NODES]), 1)
+        canvas = CanvasGraphicsView()
+        canvas.Raw = data
+        canvas.finish_loading()
+        self.assertEqual(canvas.get_nodes_raw(), self.canvas.get_nodes_raw())
+        canvas.deleteLater()
+
+    def test_v1_by_default(self) -> None:
+        isZip, data = self.save_and_read()
+        self.assertFalse(isZip)
+        self.assertEqual(data[PII.VERSION], VERSION_1)
+        self.check_content(data)
+
+    def test_v2_opt_in(self) -> None:
+        os.environ[PM_PII_VERSION] = VERSION_2
+        isZip, data = self.save_and_read()
+        self.assertTrue(isZip)
+        self.assertEqual(data[PII.VERSION], VERSION_2)
+        self.check_content(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from PuppetMaster.Core.selectionIndex import SelectionIndex, SelectionStack
+
+
+class SelectionStackTest(unittest.TestCase):
+
+    def test_order_without_duplicates(self) -> None:
+        stack = SelectionStack()
+        stack.add("a", ["x", "y"])
+        stack.add("b", ["y", "z"])
+        stack.add("a", ["x"])
+        self.assertEqual(stack.names(), ["x", "y", "z"])
+        self.assertEqual(stack.last(), "b")
+        stack.remove("a")
+        self.assertEqual(stack.names(), ["y", "z"])
+        stack.remove("b")
+        self.assertEqual(stack.names(), [])
+
+    def test_update_keeps_position(self) -> None:
+        stack = SelectionStack()
+        stack.add("a", ["a"])
+        stack.add("b", ["b"])
+        stack.add("c", ["sub:c"])
+        for node, names in (("a", ["hero:a"]), ("b", ["hero:b"]), ("c", ["hero:sub:c"])):
+            stack.update(node, names)
+        self.assertEqual(stack.names(), ["hero:a", "hero:b", "hero:sub:c"])
+        stack.add("d", ["hero:a", "d"])
+        stack.update("a", ["a"])
+        self.assertEqual(stack.names(), ["a", "hero:b", "hero:sub:c", "hero:a", "d"])
+        self.assertEqual(list(stack), ["a", "b", "c", "d"])
+
+
+class SelectionIndexTest(unittest.TestCase):
+
+    def test_nodes(self) -> None:
+        index = SelectionIndex()
+        index.add("a", ["x", "y"])
+        index.add("b", ["y"])
+        self.assertEqual(index.nodes(["y"]), {"a", "b"})
+        index.update("a", ["x", "y"], ["z"])
+        self.assertEqual(index.nodes(["x", "y"]), {"b"})
+        self.assertEqual(index.nodes(["z"]), {"a"})
+        index.remove("b", ["y"])
+        self.assertEqual(len(index), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from PuppetMaster.Core.PySideLibrary.QtWidgets import *
+from PuppetMaster.Core.PySideLibrary.QtCore import *
+from PuppetMaster.Core.PySideLibrary.QtGui import *
+from PuppetMaster.Core.dccBackend import FakeBackend, set_backend
+from PuppetMaster.Core.piiFile import decode_pii, write_pii
+from PuppetMaster.Core.qnodes import PII
+from PuppetMaster.UI.CustomeTabWidget import CanvasGraphicsViewTab
+from PuppetMaster.UI.QCanvas import CanvasGraphicsView
+
+
+class TabLoadTest(unittest.TestCase):
+    """
+    Tabs of the .pii files decoded on the worker threads.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self.backend = FakeBackend()
+        set_backend(self.backend)
+        self.directory = tempfile.mkdtemp()
+        self.tab = CanvasGraphicsViewTab()
+
+    def tearDown(self) -> None:
+        self.wait_loaded()
+        self.tab.deleteLater()
+        self.app.processEvents()
+        shutil.rmtree(self.directory)
+        set_backend(None)
+
+    def write(self, name: str, namespace: str, count: int) -> str:
+        """
+        Write a picker of count nodes in the namespace.
+        """
+        canvas = CanvasGraphicsView()
+        for i in range(count):
+            canvas.create_node(QPointF(i, i), "  ", 10, QColor(0, 0, 0), QColor(255, 255, 255),
+                               ["{}:ctrl{}".format(namespace, i)])
+        path = os.path.join(self.directory, name)
+        write_pii(path, canvas.get_raw())
+        canvas.deleteLater()
+        return path
+
+    def wait_loaded(self, timeout: float = 10.0) -> None:
+        deadline = time.perf_counter() + timeout
+        while any(each.is_loading() for each in self.tab.graphs) and time.perf_counter() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+        # handle the decoded files of the tabs which were removed
+        self.app.processEvents()
+
+    def tab_names(self) -> list:
+        return [self.tab.tabText(i) for i in range(self.tab.count())]
+
+    def test_request_order(self) -> None:
+        # the big file of the first tab is decoded last
+        paths = [self.write("first.pii", "first", 2000),
+                 os.path.join(self.directory, "broken.pii"),
+                 self.write("second.pii", "second", 1)]
+        with open(paths[1], "w") as f:
+            f.write("not a picker")
+
+        nodes = self.tab.load_sets(paths)
+        self.assertEqual(self.tab.graphs, nodes)
+        self.assertEqual(self.tab_names(), ["first.pii", "broken.pii", "second.pii"])
+
+        self.wait_loaded()
+        self.assertEqual(self.tab.graphs, [nodes[0], nodes[2]])
+        self.assertEqual(self.tab_names(), ["first", "second"])
+        self.assertEqual(len(nodes[0].get_nodes_raw()), 2000)
+        warnings = [call[1] for call in self.backend.calls if call[0] == "warning"]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("broken.pii", warnings[0])
+
+    def test_finish_loading_blocks(self) -> None:
+        path = self.write("picker.pii", "hero", 10)
+        node = self.tab.load_set(path)
+        node.finish_loading()
+        self.assertFalse(node.is_loading())
+        self.assertEqual(len(node.get_nodes_raw()), 10)
+        self.assertEqual(node.get_path(), path)
+        self.assertEqual(self.tab_names(), ["hero"])
+
+    def test_close_while_loading(self) -> None:
+        node = self.tab.load_tab("picker", decode_pii(self.write("picker.pii", "hero", 1000)))
+        self.assertTrue(node.is_loading())
+        progress = []
+        node.onLoadProgress.connect(lambda done, total: progress.append(done))
+        self.tab.remove_tab(0)
+        self.assertEqual(self.tab.graphs, [])
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            self.app.processEvents()
+        self.assertEqual(progress, [])
+
+    def test_save_while_loading(self) -> None:
+        path = self.write("picker.pii", "hero", 1000)
+        # still decoding
+        node = self.tab.load_set(path)
+        self.tab.save_set()
+        self.assertFalse(node.is_loading())
+        self.assertEqual(len(decode_pii(path)[PII.NODES]), 1000)
+        # nodes waiting to be built
+        node = self.tab.load_tab("picker", decode_pii(path))
+        self.assertTrue(node.is_loading())
+        self.assertEqual(len(node.get_raw()[PII.NODES]), 1000)
+
+    def test_changed_while_loading(self) -> None:
+        node = self.tab.load_set(self.write("picker.pii", "hero", 10))
+        self.assertTrue(node.is_changed())
+        self.assertFalse(node.is_loading())
+
+    def test_not_a_picker(self) -> None:
+        self.assertIsNone(self.tab.load_set(os.path.join(self.directory, "picker.txt")))
+        self.assertEqual(self.tab.graphs, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import time
+from typing import Optional
+from PuppetMaster.Core.PySideLibrary.QtWidgets import *
+from PuppetMaster.Core.PySideLibrary.QtCore import *
+from PuppetMaster.Core.PySideLibrary.QtGui import *
+
+from PuppetMaster.Core.commandRunner import LogLevel
+
+MAX_LOG_LINES = 2000
+LEVEL_COLORS = {
+    LogLevel.INFO: QColor(200, 200, 200),
+    LogLevel.WARNING: QColor(255, 200, 60),
+    LogLevel.ERROR: QColor(255, 110, 110),
+}
+
+
+class CommandLog(QWidget):
+    """
+    Non-modal log of the button commands.
+    """
+    onError = Signal()
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._parent = parent
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(5, 5, 5, 5)
+        main_layout.setSpacing(3)
+
+        self.logOut = QPlainTextEdit()
+        self.logOut.setReadOnly(True)
+        self.logOut.setMaximumBlockCount(MAX_LOG_LINES)
+        self.logOut.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.logOut.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        main_layout.addWidget(self.logOut)
+
+        button_layout = QHBoxLayout()
+        button_layout.setContentsMargins(0, 0, 0, 0)
+        button_layout.addStretch()
+        clearBtn = QPushButton("Clear")
+        clearBtn.clicked.connect(self.logOut.clear)
+        button_layout.addWidget(clearBtn)
+        main_layout.addLayout(button_layout)
+
+    def add_message(self, level: str, message: str) -> None:
+        """
+        Add a message at the end of the log.
+
+        :param level: LogLevel of the message.
+        :param message: Text of the message.
+        """
+        textFormat = QTextCharFormat()
+        textFormat.setForeground(LEVEL_COLORS.get(level, LEVEL_COLORS[LogLevel.INFO]))
+        cursor = self.logOut.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        if not self.logOut.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("[{}] {}: {}".format(time.strftime("%H:%M:%S"), level.upper(), message), textFormat)
+        self.logOut.ensureCursorVisible()
+        if level == LogLevel.ERROR:
+            self.onError.emit()
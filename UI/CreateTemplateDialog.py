@@ -1,12 +1,17 @@
-import os, json
 from PuppetMaster.Core.PySideLibrary.QtWidgets import *
-from PuppetMaster.Core.PySideLibrary.QtCore import Qt
+from PuppetMaster.Core.PySideLibrary.QtCore import Qt, QTimer
+from PuppetMaster.Core.PySideLibrary.QtGui import QIcon, QPixmap
 from PuppetMaster.Core.env_handler import (get_PMTemplateDir)
+from PuppetMaster.Core.templateCatalog import get_template_catalog, TemplateInfo, THUMBNAIL_SIZE
 
 
 class TemplateDialog(QDialog):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._catalog = get_template_catalog()
+        self._infoTimer = QTimer(self)
+        self._infoTimer.setInterval(50)
+        self._infoTimer.timeout.connect(self._update_infos)
         self._init_ui()
 
     def _init_ui(self) -> None:
@@ -28,8 +33,10 @@ class TemplateDialog(QDialog):
         tempText = QLabel('Template:')
         tempText.setAlignment(Qt.AlignRight)
         self.tempCombo = QComboBox()
+        self.tempCombo.setIconSize(THUMBNAIL_SIZE)
         self.tempCombo.addItem('[NO TEMPLATE]', 0)
         self._read_templates()
+        self.tempCombo.currentIndexChanged.connect(self._prefetch)
         mainLayout.addWidget(tempText, line, 0)
         mainLayout.addWidget(self.tempCombo, line, 1, 1, 2)
 
@@ -45,22 +52,42 @@ class TemplateDialog(QDialog):
         self.setWindowFlags(Qt.WindowStaysOnTopHint)
 
     def _read_templates(self) -> None:
-        template_dir = get_PMTemplateDir()
-        if os.path.exists(template_dir):
-            files = os.walk(template_dir).next()[2]
-            for each in files:
-                if each.lower().endswith(".pii"):
-                    self.tempCombo.addItem(each, each)
+        for name, path, size, mtime in self._catalog.list_templates(get_PMTemplateDir()):
+            self.tempCombo.addItem(name, path)
+            info = self._catalog.get_info(path, size, mtime)
+            if info is not None:
+                self._set_info(self.tempCombo.count() - 1, info)
+        if self._catalog.is_pending():
+            self._infoTimer.start()
+
+    def _update_infos(self) -> None:
+        """
+        Show the template metadata read in the background.
+        """
+        for info in self._catalog.poll():
+            index = self.tempCombo.findData(info.path)
+            if index != -1:
+                self._set_info(index, info)
+        if not self._catalog.is_pending():
+            self._infoTimer.stop()
+
+    def _set_info(self, index: int, info: TemplateInfo) -> None:
+        tooltip = "{} nodes".format(info.nodeCount)
+        if info.namespaces:
+            tooltip += "\nNamespaces: {}".format(", ".join(info.namespaces))
+        self.tempCombo.setItemData(index, tooltip, Qt.ToolTipRole)
+        if not info.thumbnail.isNull():
+            self.tempCombo.setItemIcon(index, QIcon(QPixmap.fromImage(info.thumbnail)))
+
+    def _prefetch(self, index: int) -> None:
+        if index > 0:
+            self._catalog.prefetch(self.tempCombo.itemData(index))
 
     def get_raw(self) -> dict:
         name = self.nameIn.text()
-        template_dir = get_PMTemplateDir()
-        template = self.tempCombo.currentText()
         data = {}
-        if template != "[NO TEMPLATE]":
-            path = os.path.join(template_dir, template)
-            with open(path, 'r') as outfile:
-                data = json.load(outfile)
+        if self.tempCombo.currentIndex() > 0:
+            data = self._catalog.load(self.tempCombo.currentData())
         return {
             'name': name,
             'data': data
@@ -1,5 +1,5 @@
-from typing import List, Optional, Dict, Literal
-import json
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Dict, Literal
 import os
 import ntpath
 from PuppetMaster.Core.PySideLibrary.QtWidgets import *
@@ -7,8 +7,10 @@ from PuppetMaster.Core.PySideLibrary.QtCore import *
 from PuppetMaster.Core.PySideLibrary.QtGui import *
 
 from PuppetMaster.Core.qnodes import PickNode, IMAGE_FORMATS
-from PuppetMaster.Core.mayaHelper import mayaNamespace, getActiveItems
-from PuppetMaster.Core.env_handler import is_PMWorkDir, get_PMTemplateDir, get_PMWorkDir
+from PuppetMaster.Core.mayaHelper import mayaNamespace, getActiveItems, warningMes
+from PuppetMaster.Core.env_handler import is_PMWorkDir, get_PMTemplateDir, get_PMWorkDir, get_PMImageDir
+from PuppetMaster.Core.piiFile import decode_pii_async, write_pii
+from PuppetMaster.Core.workspaceIndex import get_workspace_index
 from PuppetMaster.UI.NamespaceDialog import NamespaceDialog
 from PuppetMaster.UI.CreateTemplateDialog import TemplateDialog
 from PuppetMaster.UI.QCanvas import CanvasGraphicsView
@@ -17,6 +19,9 @@ from PuppetMaster.UI.QCanvas import CanvasGraphicsView
 class CanvasGraphicsViewTab(QTabWidget):
     onSelection = Signal(PickNode)
     requestEditMode = Signal(bool)
+    onLoadProgress = Signal(int, int)
+    # (path, future, callback) of a decoded file, emitted from the worker threads
+    onDecoded = Signal(str, object, object)
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
@@ -26,6 +31,16 @@ class CanvasGraphicsViewTab(QTabWidget):
         self.setTabsClosable(True)
         self.tabCloseRequested.connect(self.closeTab)
 
+        # Coalesce bursts of Maya selection events into one highlight pass
+        self._selectionStats = {'events': 0, 'passes': 0, 'skipped': 0, 'suppressed': 0}
+        self._selectionTimer = QTimer(self)
+        self._selectionTimer.setSingleShot(True)
+        self._selectionTimer.setInterval(0)
+        self._selectionTimer.timeout.connect(self.sync_selection)
+
+        # results of the worker threads are handled in the GUI thread
+        self.onDecoded.connect(self.finish_decode, Qt.QueuedConnection)
+
     def get_node(self) -> Optional[CanvasGraphicsView]:
         """
         Get the current tab node.
@@ -117,6 +132,7 @@ class CanvasGraphicsViewTab(QTabWidget):
 
         newT.requestEditMode.connect(self.send_editMode_signal)
         newT.onSelection.connect(self.send_selection_signal)
+        newT.onLoadProgress.connect(self.send_load_progress)
         self.graphs.append(newT)
         self.addTab(newT, name)
         self.setCurrentIndex(self.graphs.index(newT))
@@ -128,6 +144,58 @@ class CanvasGraphicsViewTab(QTabWidget):
     def send_editMode_signal(self, value: bool) -> None:
         self.requestEditMode.emit(value)
 
+    def send_load_progress(self, done: int, total: int) -> None:
+        self.onLoadProgress.emit(done, total)
+
+    def set_node_name(self, node: CanvasGraphicsView, text: str) -> None:
+        """
+        Set the tab name of a canvas, which isn't necessarily the active tab.
+
+        Parameters
+        ----------
+        node: (CanvasGraphicsView)
+            The canvas.
+        text: (str)
+            Name of the tab.
+        """
+        if node in self.graphs:
+            self.setTabText(self.graphs.index(node), text)
+
+    def name_by_namespace(self, node: CanvasGraphicsView) -> None:
+        """
+        Name the tab of a canvas after its first namespace.
+
+        Parameters
+        ----------
+        node: (CanvasGraphicsView)
+            The canvas.
+        """
+        firstName = node.get_first_namespace()
+        if firstName is not None:
+            self.set_node_name(node, firstName.replace(':', ''))
+
+    def apply_namespace(self, node: CanvasGraphicsView, namespace: str, rename: bool = True) -> None:
+        """
+        Replace the first namespace of a canvas.
+
+        Parameters
+        ----------
+        node: (CanvasGraphicsView)
+            The canvas.
+        namespace: (str)
+            New namespace.
+        rename: (bool)
+            Name the tab after the new namespace, otherwise after the namespace as it is given.
+        """
+        firstName = node.get_first_namespace()
+        if firstName is not None:
+            node.Namespace = {firstName: namespace}
+            node.NamespaceHistory = namespace
+            if rename:
+                self.name_by_namespace(node)
+            else:
+                self.set_node_name(node, namespace)
+
     def set_background(self) -> None:
         """
         Set the background image.
@@ -252,15 +320,27 @@ class CanvasGraphicsViewTab(QTabWidget):
         if currentNode:
             path = currentNode.get_path()
             if os.path.exists(path):
-                namespaceHistory = currentNode.NamespaceHistory
-                currentNode.clear_scene()
-                with open(path, 'r') as outfile:
-                    self.set_data(json.load(outfile))
-                piiNames = currentNode.Namespace
-                piiNames.sort()
-                if piiNames and namespaceHistory:
-                    self.set_name(namespaceHistory)
-                    currentNode.Namespace = {piiNames[0]: namespaceHistory}
+                self.decode_set(path, lambda future: self.reload_tab(currentNode, future))
+
+    def reload_tab(self, node: CanvasGraphicsView, future: Future) -> None:
+        """
+        Replace the content of a canvas, keeping its namespace.
+
+        Parameters
+        ----------
+        node: (CanvasGraphicsView)
+            The canvas.
+        future: (Future)
+            Finished decode_pii_async of the file.
+        """
+        # closed while the file was decoding, or the file can't be read
+        if node not in self.graphs or future.exception() is not None:
+            return
+        namespaceHistory = node.NamespaceHistory
+        node.clear_scene()
+        node.Raw = future.result()
+        if namespaceHistory:
+            node.call_when_loaded(lambda: self.apply_namespace(node, namespaceHistory, rename=False))
 
     def force_load(self, paths: List[str]) -> None:
         """
@@ -271,10 +351,8 @@ class CanvasGraphicsViewTab(QTabWidget):
         paths: (list)
             List of .PII file.
         """
-        for path in paths:
-            if os.path.isfile(path):
-                path = os.path.expandvars(path)
-                self.load_set(path)
+        paths = [os.path.expandvars(path) for path in paths]
+        self.load_sets([path for path in paths if os.path.isfile(path)])
 
     def findAndLoad(self, names: List[Dict[Literal["name", "namespace"],str]]) -> None:
         """
@@ -282,53 +360,119 @@ class CanvasGraphicsViewTab(QTabWidget):
 
         :param names: List of dictionaries of name and namespace.
         """
-        template_dir = get_PMWorkDir()
-        files = os.walk(template_dir).next()[2]
-        for each in names:
-            name = each['name']
-            namespace = each['namespace']
-
-            # valid files
-            name_list = []
-            for each in files:
-                if name in each:
-                    name_list.append(each)
-
-            if name_list:
-                name_list.sort()
-                file_path = os.path.join(template_dir, name_list[-1])
-                self.load_set(file_path)
-
-                node = self.get_node()
-                if node and namespace:
-                    piiNames = node.Namespace
-                    piiNames.sort()
-                    node.Namespace = {piiNames[0]: namespace}
-                    node.NamespaceHistory = namespace
-                    # update tab name
-                    piiNames = node.Namespace
-                    piiNames.sort()
-                    if piiNames:
-                        self.set_name(piiNames[0].replace(':', ''))
-
-    def load_set(self, path: str) -> None:
-        """
-        Load the .PII files
+        index = get_workspace_index(get_PMWorkDir())
+        paths = []
+        namespaces = []
+        for each, path in zip(names, index.resolve([each['name'] for each in names])):
+            if path:
+                paths.append(path)
+                namespaces.append(each['namespace'])
+
+        for node, namespace in zip(self.load_sets(paths), namespaces):
+            if node and namespace:
+                node.call_when_loaded(lambda node=node, namespace=namespace: self.apply_namespace(node, namespace))
+
+    def load_set(self, path: str) -> Optional[CanvasGraphicsView]:
+        """
+        Load the .PII file. The tab is added right away and the file is read
+        and decoded on a worker thread, then the nodes keep loading after it.
+        Use call_when_loaded of the canvas to wait for the nodes, or
+        finish_loading to block until they are all built.
+
+        Parameters
+        ----------
+        path: (str)
+            Path of .PII file.
+
+        Return
+        ------
+        out: (CanvasGraphicsView)
+            The new canvas, None if the path isn't a .PII file.
+        """
+        if not path or not path.lower().endswith(".pii"):
+            return None
+        node = self.load_tab(name=ntpath.basename(path), data={})
+        node.Path = path
+        node.load_async(self.decode_set(path, lambda future: self.finish_load(node, future)))
+        node.call_when_loaded(lambda: self.name_by_namespace(node))
+        return node
+
+    def load_sets(self, paths: List[str]) -> List[Optional[CanvasGraphicsView]]:
+        """
+        Load the .PII files. The tabs are added right away in the order of
+        the paths, the files are read and decoded in parallel and each tab is
+        filled as soon as its file is decoded.
+
+        Parameters
+        ----------
+        paths: (list)
+            List of .PII file paths.
+
+        Return
+        ------
+        out: (list)
+            The new canvases, None for the paths which aren't .PII files.
+        """
+        return [self.load_set(path) for path in paths]
+
+    def finish_load(self, node: CanvasGraphicsView, future: Future) -> None:
+        """
+        Fill the canvas of load_set with its decoded file, or remove its tab
+        if the file can't be read.
+
+        Parameters
+        ----------
+        node: (CanvasGraphicsView)
+            The canvas.
+        future: (Future)
+            Finished decode_pii_async of the file.
+        """
+        if node not in self.graphs:
+            return
+        if future.exception() is not None:
+            self.remove_tab(self.graphs.index(node))
+            return
+        node.set_decoded(future)
+
+    def decode_set(self, path: str, onDecoded: Callable[[Future], None]) -> Future:
+        """
+        Read and decode the .PII file on a worker thread, then call onDecoded
+        with the finished future in the GUI thread. A file which can't be read
+        is reported on its own.
 
         Parameters
         ----------
         path: (str)
             Path of .PII file.
+        onDecoded: (Callable)
+            Called with the finished decode_pii_async of the file.
+
+        Return
+        ------
+        out: (Future)
+            Future of the decoded scene data, see decode_pii.
+        """
+        future = decode_pii_async(path)
+        future.add_done_callback(lambda future: self.onDecoded.emit(path, future, onDecoded))
+        return future
+
+    def finish_decode(self, path: str, future: Future, onDecoded: Callable[[Future], None]) -> None:
         """
-        if path and path.lower().endswith(".pii"):
-            with open(path, 'r') as outfile:
-                self.load_tab(name=ntpath.basename(path), data=json.load(outfile))
-                self.set_path(path)
-                node = self.get_node()
-                piiNames = node.Namespace
-                piiNames.sort()
-                if piiNames:
-                    self.set_name(piiNames[0].replace(':', ''))
+        Hand the result of decode_set to its callback, in the GUI thread.
+
+        Parameters
+        ----------
+        path: (str)
+            Path of .PII file.
+        future: (Future)
+            Finished decode_pii_async of the file.
+        onDecoded: (Callable)
+            Called with the future.
+        """
+        error = future.exception()
+        if error is not None:
+            warningMes("PUPPETMASTER-INFO: Can't load '{}': {}".format(path, error))
+        onDecoded(future)
 
     def saveAs_set(self) -> None:
         """
@@ -348,8 +492,7 @@ class CanvasGraphicsViewTab(QTabWidget):
                     file_path = newPath
 
                 self.set_path(file_path)
-                with open(file_path, 'w') as outfile:
-                    json.dump(scene_data, outfile, ensure_ascii=False, indent=4)
+                write_pii(file_path, scene_data, get_PMImageDir())
 
     def saveAsTemplate_set(self) -> None:
         """
@@ -367,8 +510,7 @@ class CanvasGraphicsViewTab(QTabWidget):
                     file_path = newPath + ".pii"
                 else:
                     file_path = newPath
-                with open(file_path, 'w') as outfile:
-                    json.dump(scene_data, outfile, ensure_ascii=False, indent=4)
+                write_pii(file_path, scene_data, get_PMImageDir())
 
     def rename_set(self) -> None:
         """
@@ -394,8 +536,21 @@ class CanvasGraphicsViewTab(QTabWidget):
         buttonReply = QMessageBox.warning(self, 'Close Tab', message, QMessageBox.Cancel | QMessageBox.Ok,
                                           QMessageBox.Ok)
         if buttonReply == QMessageBox.Ok:
-            del self.graphs[index]
-            self.removeTab(index)
+            self.remove_tab(index)
+
+    def remove_tab(self, index: int) -> None:
+        """
+        Remove the tab without confirmation, dropping the file it is loading.
+
+        Parameters
+        ----------
+        index: (int)
+            Index of the tab.
+        """
+        node = self.graphs.pop(index)
+        node.stop_loading()
+        self.removeTab(index)
+        node.deleteLater()
 
     def closeCurrentTab(self) -> None:
         """
@@ -417,13 +572,68 @@ class CanvasGraphicsViewTab(QTabWidget):
                 scene_data = self.get_data()
                 fileName = self.get_name()
                 self.set_path(file_path)
-                with open(file_path, 'w') as outfile:
-                    json.dump(scene_data, outfile, ensure_ascii=False, indent=4)
+                write_pii(file_path, scene_data, get_PMImageDir())
             else:
                 self.saveAs_set()
 
+    def get_debounce(self) -> int:
+        """
+        Get the selection debounce window in milliseconds.
+        """
+        return self._selectionTimer.interval()
+
+    def set_debounce(self, msec: int) -> None:
+        """
+        Set the selection debounce window.
+
+        Parameters
+        ----------
+        msec: (int)
+            Milliseconds to wait for more selection events before highlighting,
+            0 runs once the event loop is idle.
+        """
+        self._selectionTimer.setInterval(max(0, msec))
+
+    SelectionDebounce = property(get_debounce, set_debounce)
+
+    def get_selection_stats(self) -> Dict[str, int]:
+        """
+        Get the selection sync counters.
+
+        Return
+        ------
+        out: (dict)
+            Number of Maya 'events' received, highlight 'passes' executed,
+            passes 'skipped' because the selection didn't change and events
+            'suppressed' because the canvas itself changed the selection.
+        """
+        return dict(self._selectionStats)
+
+    def reset_selection_stats(self) -> None:
+        """ Reset the selection sync counters. """
+        for key in self._selectionStats:
+            self._selectionStats[key] = 0
+
     def maya_selection(self, *args, **kwargs) -> None:
-        selected = getActiveItems()
+        """
+        Schedule a highlight pass, merging the events within the debounce window.
+        """
+        self._selectionStats['events'] += 1
+        node = self.get_node()
+        if node and node.is_syncing_selection():
+            self._selectionStats['suppressed'] += 1
+            return
+        self._selectionTimer.start()
+
+    def sync_selection(self) -> None:
+        """
+        Highlight the active tab base on Maya selection.
+        """
         node = self.get_node()
         if node:
+            selected = getActiveItems()
+            if frozenset(selected) == frozenset(node.Highlight):
+                self._selectionStats['skipped'] += 1
+                return
             node.Highlight = selected
+            self._selectionStats['passes'] += 1
@@ -7,8 +7,10 @@ from PuppetMaster.Core.PySideLibrary.QtCore import *
 
 from PuppetMaster.Core.qnodes import PickNode
 from PuppetMaster.Core.mayaHelper import warningMes
+from PuppetMaster.Core.commandRunner import get_command_runner
 from PuppetMaster.UI.CustomeTabWidget import CanvasGraphicsViewTab
 from PuppetMaster.UI.ParametersWidget import Parameters
+from PuppetMaster.UI.CommandLog import CommandLog
 
 
 class PuppetMaster(QMainWindow):
@@ -47,7 +49,21 @@ class PuppetMaster(QMainWindow):
         self.parameterDock.setVisible(self.editMode)
         self.addDockWidget(Qt.BottomDockWidgetArea, self.parameterDock)
 
+        # Command Log, shown when a command fails
+        self.commandLog = CommandLog(parent=self)
+
+        self.logDock = QDockWidget(": Command Log ::", self)
+        self.logDock.setObjectName('CommandLog')
+        self.logDock.setFeatures(QDockWidget.DockWidgetClosable)
+        self.logDock.setWidget(self.commandLog)
+        self.logDock.setVisible(False)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.logDock)
+
+        get_command_runner().onLog.connect(self.commandLog.add_message)
+        self.commandLog.onError.connect(self.logDock.show)
+
         self.tab.onSelection.connect(self.update_parameters)
+        self.tab.onLoadProgress.connect(self.update_load_progress)
         self.parameter.onChangeBGColor.connect(self.tab.update_bg_color)
         self.parameter.onChangeFontColor.connect(self.tab.update_font_color)
         self.parameter.onChangeFontSize.connect(self.tab.update_font_size)
@@ -63,6 +79,13 @@ class PuppetMaster(QMainWindow):
         """ Call this method when you want to update the selection in the tab. """
         self.tab.maya_selection()
 
+    def update_load_progress(self, done: int, total: int) -> None:
+        """ Show the progress of loading nodes in the status bar. """
+        if done < total:
+            self.statusBar().showMessage("Loading nodes {}/{}".format(done, total))
+        else:
+            self.statusBar().clearMessage()
+
     def update_parameters(self, node: PickNode) -> None:
         shape = node.Shape if isinstance(node, PickNode) else ""
         self.parameter.update_param(
@@ -153,6 +176,13 @@ class PuppetMaster(QMainWindow):
         self.namespace_action.triggered.connect(self.tab.set_namespace)
         picker_menu.addAction(self.namespace_action)
 
+        picker_menu.addSeparator()
+
+        log_action = self.logDock.toggleViewAction()
+        log_action.setText("&Command Log")
+        log_action.setStatusTip('Show the log of the button commands.')
+        picker_menu.addAction(log_action)
+
         help_menu = window_menu.addMenu("&Help")
 
         wiki_action = QAction("&About PuppetMaster...", self)
@@ -4,8 +4,7 @@ from PuppetMaster.Core.PySideLibrary.QtCore import *
 from PuppetMaster.Core.PySideLibrary.QtWidgets import *
 from PuppetMaster.Core.PySideLibrary.QtGui import *
 
-from maya import OpenMaya
-
+from PuppetMaster.Core.dccBackend import get_backend
 from PuppetMaster.UI.CustomeWidget import PuppetMaster
 
 TITLE = "Puppet Master v1.0.1"
@@ -57,7 +56,7 @@ class PuppetMasterMainWindow(QMainWindow):
         self.onSelectionChanged.connect(widget.callSelectionChanged)
 
     # ====================== Maya Signals ======================
-    def _onSelectionChanged(self, arg: None) -> None:
+    def _onSelectionChanged(self) -> None:
         """ Signal of maya call when selection changed. """
         self.onSelectionChanged.emit()
 
@@ -65,13 +64,13 @@ class PuppetMasterMainWindow(QMainWindow):
         """ Bind Maya signals. """
         if self._signals: self.removeSignals()
         self._signals.append(
-            OpenMaya.MEventMessage.addEventCallback("SelectionChanged", self._onSelectionChanged)
+            get_backend().add_selection_callback(self._onSelectionChanged)
         )
 
     def removeSignals(self) -> None:
         """ Remove Maya signals. """
         if self._signals:
-            for _ in self._signals: OpenMaya.MMessage.removeCallback(_)
+            for _ in self._signals: get_backend().remove_callback(_)
         self._signals.clear()
 
     def closeEvent(self, event: QCloseEvent) -> None:
@@ -1,18 +1,39 @@
-from typing import Optional, List
+import os
+import time
+import base64
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional, List, Tuple, Callable
 from PuppetMaster.Core.PySideLibrary.QtWidgets import *
 from PuppetMaster.Core.PySideLibrary.QtCore import *
 from PuppetMaster.Core.PySideLibrary.QtGui import *
 
 from PuppetMaster.Core.PkgResources import PkgResources
-from PuppetMaster.Core.qnodes import (IMAGE_FORMATS, PickNode, ButtonNode, PII, PIINode, PIIPick, PickShape,
-                                      CommandType, PIIButton)
-from PuppetMaster.Core.mayaHelper import (selectObjects, getActiveItems, clearSelection, runPython, runMel, errorMes)
+from PuppetMaster.Core.qnodes import (IMAGE_FORMATS, PickNode, ButtonNode, PII, PIINode, PIIPick,
+                                      PickShape, CommandType, PIIButton)
+from PuppetMaster.Core.mayaHelper import (replaceSelection, getActiveItems, errorMes)
+from PuppetMaster.Core.selectionIndex import SelectionIndex, SelectionStack
+from PuppetMaster.Core.namespaceRemap import NamespaceRemapper
+from PuppetMaster.Core.namespaceRegistry import NamespaceRegistry
+from PuppetMaster.Core.nodeStyle import StyleTable, get_font, get_color, color_raw
+from PuppetMaster.Core.piiFile import VERSION_1, VERSION_2
+from PuppetMaster.Core.env_handler import get_PMPiiVersion
+from PuppetMaster.Core.commandRunner import get_command_runner, CommandJob
+from PuppetMaster.Core.dccBackend import get_backend
 from PuppetMaster.UI.CommandDialog import CommandDialog
 
+# Fixed BSP depth, 2^10 leaves split the default 4096x2160 canvas into cells about
+# the size of a picker and adding nodes never triggers a re-bucketing of the tree.
+BSP_TREE_DEPTH = 10
+# Seconds of node construction per event loop turn while loading a .pii
+LOAD_TIME_SLICE = 0.01
+
 
 class CanvasGraphicsView(QGraphicsView):
     onSelection = Signal(PickNode)
     requestEditMode = Signal(bool)
+    onLoadProgress = Signal(int, int)
+    onLoadFinished = Signal()
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -36,20 +57,47 @@ class CanvasGraphicsView(QGraphicsView):
     def init(self) -> None:
         self.piiPath = ""
         self._model = {
-            'background': ""
+            'background': "",
+            'backgroundData': b"",
+            'backgroundFormat': "",
+            'backgroundBase64': None
         }
         self._isPanning = False
         self._isZooming = False
         self._mousePressed = False
-        self._scene = QGraphicsScene()
-        self._scene.selectionChanged.connect(self.update_node_settings)
+        # the click started on a button, its command works on the Maya selection
+        self._buttonPressed = False
+        self._scene = QGraphicsScene(self)
+        self._scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self._scene.setBspTreeDepth(BSP_TREE_DEPTH)
+        self._scene.selectionChanged.connect(self.selection_changed)
+        self._itemBounds = {}
+        self._sceneBounds = QRectF()
+        self._boundsDirty = False
         self._backgroundNode = QGraphicsPixmapItem()
         self._scene.addItem(self._backgroundNode)
-        self._orderSelected = []
+        self.track_bounds(self._backgroundNode)
+        # selected PickNodes in the order they were selected
+        self._orderSelected = SelectionStack()
+        self._selected = set()
         self._lastPos = QPoint(0, 0)
         self.editMode = False
+        # clicked buttons are selected for run_macro instead of running
+        self.macroMode = False
         self._namespace = ""
         self._dragMulti = []
+        self._selectionIndex = SelectionIndex()
+        self._namespaces = NamespaceRegistry()
+        self._highlighted = set()
+        self._highlightNames = frozenset()
+        self._syncingSelection = False
+        self._pendingNodes = deque()
+        self._loadTotal = 0
+        self._loadCallbacks = []
+        self._decoding = None
+        self._loadTimer = QTimer(self)
+        self._loadTimer.setInterval(0)
+        self._loadTimer.timeout.connect(self.load_batch)
 
         self._defaultColor = QColor(255, 255, 255)
         self._defaultTextColor = QColor(0, 0, 0)
@@ -63,9 +111,26 @@ class CanvasGraphicsView(QGraphicsView):
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.setBackgroundImage("")
 
+    def selection_changed(self) -> None:
+        """
+        Update the selection stack from the scene selection, in one pass for all the changed nodes.
+        """
+        selected = self._scene.selectedItems()
+        current = set(selected)
+        for each in self._selected - current:
+            self._orderSelected.remove(each)
+        added = [each for each in selected if each not in self._selected]
+        for each in added:
+            if isinstance(each, PickNode):
+                self._orderSelected.add(each, each.Items)
+        self._selected = current
+        if added:
+            self.onSelection.emit(added[-1])
+        self.update_node_settings()
+
     def update_node_settings(self) -> None:
-        if self._orderSelected:
-            node = self._orderSelected[-1]
+        node = self._orderSelected.last()
+        if node is not None:
             self._defaultText = node.toPlainText()
             self._defaultColor = node.Background
             self._defaultTextColor = node.defaultTextColor()
@@ -75,12 +140,26 @@ class CanvasGraphicsView(QGraphicsView):
         """
         Update Maya Scene base on active selection.
         """
-        clearSelection()
-        selection = []
-        for each in self._orderSelected:
-            selection += each.Items
-        if selection:
-            selectObjects(selection)
+        selection = self._orderSelected.names()
+        # Maya echoes the change back as SelectionChanged events, ignore them
+        # and highlight straight from the selection we've just pushed.
+        self._syncingSelection = True
+        try:
+            replaceSelection(selection)
+        finally:
+            self._syncingSelection = False
+        self.set_highlight(selection)
+
+    def is_syncing_selection(self) -> bool:
+        """
+        Check if the canvas is writing its selection to Maya.
+
+        Return
+        ------
+        out: (bool)
+            True while the Maya selection is being replaced, otherwise False.
+        """
+        return self._syncingSelection
 
     def setBackgroundImage(self, path: str) -> None:
         """
@@ -88,8 +167,11 @@ class CanvasGraphicsView(QGraphicsView):
         """
         self._model['background'] = path
         self.setStatusTip(self._model['background'])
-        pixmap = QPixmap(self._model['background'])
-        self._backgroundNode.setPixmap(pixmap)
+        imageData = b""
+        if os.path.isfile(path):
+            with open(path, 'rb') as infile:
+                imageData = infile.read()
+        self.set_background_data(imageData, os.path.splitext(path)[1][1:].lower())
 
     def getBackgroundImage(self) -> str:
         """
@@ -99,6 +181,63 @@ class CanvasGraphicsView(QGraphicsView):
 
     BackgroundImage = property(getBackgroundImage, setBackgroundImage)
 
+    def set_background_data(self, data: bytes, imageFormat: str, image: Optional[QImage] = None) -> None:
+        """
+        Set background image from the encoded image file content.
+
+        :param data: Content of the image file.
+        :param imageFormat: Image file format (e.g. "png").
+        :param image: The image already decoded from the data, e.g. on a worker thread.
+        """
+        self._model['backgroundData'] = data
+        self._model['backgroundFormat'] = imageFormat if data else ""
+        self._model['backgroundBase64'] = None
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+        else:
+            pixmap = QPixmap()
+            if data:
+                pixmap.loadFromData(data)
+        self._backgroundNode.setPixmap(pixmap)
+        self.track_bounds(self._backgroundNode)
+
+    def get_background_data(self) -> Tuple[bytes, str]:
+        """
+        Get the encoded background image, as it was loaded.
+
+        :return: Content of the image file and its format.
+        """
+        if not self._model['backgroundData']:
+            pixmap = self._backgroundNode.pixmap()
+            if self._model['backgroundBase64']:
+                self._model['backgroundData'] = base64.b64decode(self._model['backgroundBase64'])
+                self._model['backgroundFormat'] = "png"
+            elif not pixmap.isNull():
+                buffer = QBuffer()
+                buffer.open(QIODevice.WriteOnly)
+                pixmap.save(buffer, "PNG")
+                self._model['backgroundData'] = bytes(buffer.data())
+                self._model['backgroundFormat'] = "png"
+        return self._model['backgroundData'], self._model['backgroundFormat']
+
+    def get_background_base64(self) -> str:
+        """
+        Get the background image as base64 PNG data of .pii v1.
+        The result is kept until the background is replaced.
+
+        :return: Base64 PNG data, empty if there's no background.
+        """
+        if self._model['backgroundBase64'] is None:
+            imageData, imageFormat = self.get_background_data()
+            if imageData and imageFormat != "png":
+                # v1 only stores PNG
+                buffer = QBuffer()
+                buffer.open(QIODevice.WriteOnly)
+                self._backgroundNode.pixmap().save(buffer, "PNG")
+                imageData = bytes(buffer.data())
+            self._model['backgroundBase64'] = base64.b64encode(imageData).decode('ascii')
+        return self._model['backgroundBase64']
+
     def actionMenu(self, mousePose: QPoint) -> None:
         """
         Show action menu.
@@ -188,6 +327,19 @@ class CanvasGraphicsView(QGraphicsView):
 
         self.mainMenu.addSeparator()
 
+        macro_mode = self.mainMenu.addAction('Macro Mode')
+        macro_mode.setCheckable(True)
+        macro_mode.setChecked(self.macroMode)
+        macro_mode.setEnabled(not self.editMode)
+        macro_mode.triggered.connect(lambda: self.set_macro_mode(not self.macroMode))
+
+        macro_action = self.mainMenu.addAction('Run Macro')
+        macro_action.setShortcut('Return')
+        macro_action.setEnabled(self.macroMode and not self.editMode and bool(self.get_macro_buttons()))
+        macro_action.triggered.connect(self.run_macro)
+
+        self.mainMenu.addSeparator()
+
         edit_mode = self.mainMenu.addAction('Edit Mode')
         edit_mode.setCheckable(True)
         edit_mode.setChecked(self.editMode)
@@ -200,10 +352,9 @@ class CanvasGraphicsView(QGraphicsView):
     def mouse_on_node(self) -> Optional[PickNode]:
         globPosition = self.mapFromGlobal(QCursor.pos())
         scenePosition = self.mapToScene(globPosition)
-        for node in self._scene.items():
+        for node in self._scene.items(scenePosition, Qt.IntersectsItemShape, Qt.DescendingOrder):
             if isinstance(node, PickNode):
-                if node.mapRectToScene(node.boundingRect()).contains(scenePosition):
-                    return node
+                return node
         return None
 
     def update_node(self, node: PickNode) -> None:
@@ -377,12 +528,9 @@ class CanvasGraphicsView(QGraphicsView):
         """
         Fit all the items to the view.
         """
-        items = self._scene.items()
-        if items:
-            rects = [item.mapToScene(item.boundingRect()).boundingRect() for item in items]
-            rect = self.min_bounding_rect(rects)
-            self._scene.setSceneRect(rect)
-            self.fitInView(rect, Qt.KeepAspectRatio)
+        rect = self.scene_bounds()
+        self._scene.setSceneRect(rect)
+        self.fitInView(rect, Qt.KeepAspectRatio)
 
     def frame_view(self) -> None:
         """
@@ -398,12 +546,59 @@ class CanvasGraphicsView(QGraphicsView):
         """
         Update the scene boundery.
         """
-        items = self._scene.items()
-        if items:
-            rects = [item.mapToScene(item.boundingRect()).boundingRect() for item in items]
-            rect = self.min_bounding_rect(rects)
+        rect = self.scene_bounds()
+        if rect != self._scene.sceneRect():
             self._scene.setSceneRect(rect)
 
+    def scene_bounds(self) -> QRectF:
+        """
+        Get the bounding rectangle of all the items in the scene.
+
+        :return: QRectF, cached union of the items scene bounding rectangles.
+        """
+        if self._boundsDirty:
+            bounds = QRectF()
+            for rect in self._itemBounds.values():
+                bounds = bounds.united(rect)
+            self._sceneBounds = bounds
+            self._boundsDirty = False
+        return QRectF(self._sceneBounds)
+
+    def track_bounds(self, item: QGraphicsItem) -> None:
+        """
+        Update the cached scene bounds with an added, moved or resized item.
+        The bounds are only rebuilt if the item was on the edge and moved inward.
+
+        :param item: Reference to the item.
+        """
+        if item.scene() is not self._scene:
+            return
+        rect = item.sceneBoundingRect()
+        old = self._itemBounds.get(item)
+        self._itemBounds[item] = rect
+        if self._boundsDirty:
+            return
+        bounds = self._sceneBounds
+        if old is not None and ((old.left() <= bounds.left() < rect.left()) or
+                                (old.top() <= bounds.top() < rect.top()) or
+                                (old.right() >= bounds.right() > rect.right()) or
+                                (old.bottom() >= bounds.bottom() > rect.bottom())):
+            self._boundsDirty = True
+        else:
+            self._sceneBounds = bounds.united(rect)
+
+    def untrack_bounds(self, item: QGraphicsItem) -> None:
+        """
+        Remove an item from the cached scene bounds.
+
+        :param item: Reference to the removed item.
+        """
+        old = self._itemBounds.pop(item, None)
+        bounds = self._sceneBounds
+        if old is not None and (old.left() <= bounds.left() or old.top() <= bounds.top() or
+                                old.right() >= bounds.right() or old.bottom() >= bounds.bottom()):
+            self._boundsDirty = True
+
     def request_edit(self, value=bool) -> None:
         self.requestEditMode.emit(value)
 
@@ -434,12 +629,9 @@ class CanvasGraphicsView(QGraphicsView):
         """
         selected = self._scene.selectedItems()
         for each in selected:
-            font = each.font()
-            fontSize = font.pointSize()
+            fontSize = each.font().pointSize()
             if fontSize < 99:
-                fontSize += 1
-                font.setPointSize(fontSize)
-                each.setFont(font)
+                each.setFont(get_font(fontSize + 1))
 
     def decrease_size(self) -> None:
         """
@@ -447,12 +639,9 @@ class CanvasGraphicsView(QGraphicsView):
         """
         selected = self._scene.selectedItems()
         for each in selected:
-            font = each.font()
-            fontSize = font.pointSize()
+            fontSize = each.font().pointSize()
             if fontSize > 1:
-                fontSize -= 1
-                font.setPointSize(fontSize)
-                each.setFont(font)
+                each.setFont(get_font(fontSize - 1))
 
     def is_texture(self, path: str) -> None:
         """
@@ -512,6 +701,7 @@ class CanvasGraphicsView(QGraphicsView):
     def mousePressEvent(self, event: QMouseEvent) -> None:
         self._lastPos = event.pos()
         self._lastScenePos = self.mapToScene(event.pos())
+        self._buttonPressed = isinstance(self.itemAt(event.pos()), ButtonNode)
         if self._dragMulti:
             for each in self._dragMulti:
                 each.setSelected(True)
@@ -583,7 +773,13 @@ class CanvasGraphicsView(QGraphicsView):
         self.setCursor(Qt.ArrowCursor)
         super().mouseReleaseEvent(event)
         self.fit_contents()
-        self.update_maya_selection()
+        # the queued command of a button runs after the release, and the
+        # buttons picked for a macro don't select anything in Maya
+        selected = self._scene.selectedItems()
+        onlyButtons = bool(selected) and all(isinstance(each, ButtonNode) for each in selected)
+        if not (self._buttonPressed or onlyButtons):
+            self.update_maya_selection()
+        self._buttonPressed = False
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
         if event.key() == Qt.Key_Backspace or event.key() == Qt.Key_Delete:
@@ -599,6 +795,9 @@ class CanvasGraphicsView(QGraphicsView):
             self.reset_view()
         elif event.key() == Qt.Key_F:
             self.frame_view()
+        elif event.key() in (Qt.Key_Return, Qt.Key_Enter):
+            if self.macroMode and not self.editMode:
+                self.run_macro()
         else:
             super().keyPressEvent(event)
 
@@ -608,7 +807,13 @@ class CanvasGraphicsView(QGraphicsView):
         """
         for each in self._scene.selectedItems():
             self._scene.removeItem(each)
+            self.untrack_bounds(each)
             self.remove_stack(each)
+            self._selected.discard(each)
+            if isinstance(each, PickNode):
+                self._selectionIndex.remove(each, each.Items)
+                self._namespaces.remove(each.Items)
+                self._highlighted.discard(each)
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         factor = 1.05
@@ -672,25 +877,22 @@ class CanvasGraphicsView(QGraphicsView):
         :param shape: Shape of the node.
         """
         textNode = PickNode()
-        font = QFont("SansSerif", size)
-        font.setStyleHint(QFont.Helvetica)
-        textNode.setFont(font)
+        textNode.setFont(get_font(size))
         textNode.setDefaultTextColor(textColor)
         textNode.setFlag(QGraphicsItem.ItemIsMovable, self.editMode)
         textNode.setFlag(QGraphicsItem.ItemIsSelectable)
         # textNode.setFlag(QGraphicsItem.ItemIsFocusable, self.editMode)
         textNode.Background = bgColor
+        textNode.onItemsChanged.connect(self.update_index)
         textNode.Items = items
         textNode.Shape = shape
 
-        textNode.onSelected.connect(lambda: self.onSelection.emit(textNode))
-        textNode.onAddToStack.connect(lambda: self.add_stack(textNode))
-        textNode.onRemoveFromStack.connect(lambda: self.remove_stack(textNode))
-
         textNode.setPos(position)
         textNode.setPlainText(text)
 
         self._scene.addItem(textNode)
+        self.track_bounds(textNode)
+        textNode.onGeometryChanged.connect(self.track_bounds)
         return textNode
 
     def create_button(self,
@@ -713,9 +915,7 @@ class CanvasGraphicsView(QGraphicsView):
         :param cmdType: Type of command.("python"/"mel")
         """
         btnNode = ButtonNode()
-        font = QFont("SansSerif", size)
-        font.setStyleHint(QFont.Helvetica)
-        btnNode.setFont(font)
+        btnNode.setFont(get_font(size))
         btnNode.setDefaultTextColor(textColor)
         btnNode.setFlag(QGraphicsItem.ItemIsMovable, self.editMode)
         btnNode.setFlag(QGraphicsItem.ItemIsSelectable)
@@ -723,35 +923,109 @@ class CanvasGraphicsView(QGraphicsView):
         btnNode.CommandsType = cmdType
         btnNode.Command = cmd
 
-        # btnNode.onSelected.connect(lambda: self.onSelection.emit(textNode))
-        btnNode.onSelected.connect(lambda: self.onSelection.emit(btnNode))
         btnNode.onClicked.connect(self.scriptJob)
 
         btnNode.setPos(position)
         btnNode.setPlainText(text)
 
         self._scene.addItem(btnNode)
+        self.track_bounds(btnNode)
+        btnNode.onGeometryChanged.connect(self.track_bounds)
 
-    def scriptJob(self, cmdType: str, cmd: str) -> None:
+    def scriptJob(self, cmdType: str, cmd: str, node: Optional[ButtonNode] = None) -> None:
         """
-        Run a command.
+        Queue a command on the command runner, it runs on the next event loop turn.
+        Python commands of a ButtonNode keep their globals between runs, and
+        the execution time is recorded on the node.
 
         :param cmd: Command to run.
         :param cmdType: Type of command.("python"/"mel")
+        :param node: ButtonNode of the command, the sender of onClicked by default.
         """
-        if not self.editMode:
-            if CommandType(cmdType) == CommandType.PYTHON:
-                runPython(cmd)
-            elif CommandType(cmdType) == CommandType.MEL:
-                runMel(cmd)
+        if not self.editMode and not self.macroMode:
+            if node is None and isinstance(self.sender(), ButtonNode):
+                node = self.sender()
+            get_command_runner().submit(cmdType, cmd, node)
 
-    def add_stack(self, node: PickNode) -> None:
+    def get_macro_mode(self) -> bool:
+        return self.macroMode
+
+    def set_macro_mode(self, value: bool) -> None:
         """
-        Add a node selection in the right order into the stack.
+        Toggle the macro mode, where clicking the buttons selects them for
+        run_macro instead of running their commands.
 
-        :param node: Reference to the selected node.
+        :param value: True to enable the macro mode.
         """
-        self._orderSelected.append(node)
+        self.macroMode = value
+
+    MacroMode = property(get_macro_mode, set_macro_mode)
+
+    def get_macro_buttons(self) -> List[ButtonNode]:
+        """
+        Get the selected ButtonNodes in the order of a macro, top to bottom then left to right.
+        """
+        buttons = [each for each in self._scene.selectedItems() if type(each) == ButtonNode]
+        buttons.sort(key=lambda each: (each.pos().y(), each.pos().x()))
+        return buttons
+
+    def run_macro(self, buttons: Optional[List[ButtonNode]] = None, name: str = "PuppetMaster Macro") -> int:
+        """
+        Run the commands of several buttons in one pass, as a single undo step
+        with the viewport refresh suspended. A failing command is logged and
+        the next ones still run.
+
+        :param buttons: ButtonNodes to run, the macro buttons by default.
+        :param name: Name of the undo step.
+
+        :return: Number of failed commands.
+        """
+        buttons = self.get_macro_buttons() if buttons is None else buttons
+        if not buttons:
+            return 0
+        runner = get_command_runner()
+        # clicks waiting in the queue ran before the macro
+        runner.flush()
+        failed = 0
+        with get_backend().batch(name):
+            for each in buttons:
+                if each.Command and not runner.execute(CommandJob(each.CommandsType, each.Command, each)):
+                    failed += 1
+        return failed
+
+    def get_command_stats(self) -> List[dict]:
+        """
+        Get the execution time of the ButtonNode commands.
+
+        :return: List of the statistics of each button, see CommandStats.raw, with its text.
+        """
+        stats = []
+        for each in self._scene.items():
+            if type(each) == ButtonNode:
+                item = each.Stats.raw()
+                item['text'] = each.toPlainText()
+                stats.append(item)
+        return stats
+
+    def update_index(self, node: PickNode, oldNames: List[str], newNames: List[str]) -> None:
+        """
+        Keep the selection index in sync with the node selection.
+
+        :param node: Reference to the changed node.
+        :param oldNames: Previous list of Maya object names.
+        :param newNames: Current list of Maya object names.
+        """
+        self._selectionIndex.update(node, oldNames, newNames)
+        self._namespaces.update(oldNames, newNames)
+        self._orderSelected.update(node, newNames)
+        if self._highlightNames:
+            highlight = not self._highlightNames.isdisjoint(newNames)
+            if highlight != node.Highlight:
+                node.Highlight = highlight
+                if highlight:
+                    self._highlighted.add(node)
+                else:
+                    self._highlighted.discard(node)
 
     def remove_stack(self, node: PickNode) -> None:
         """
@@ -759,9 +1033,7 @@ class CanvasGraphicsView(QGraphicsView):
 
         :param node: Reference to the selected node.
         """
-        if node in self._orderSelected:
-            index = self._orderSelected.index(node)
-            self._orderSelected.pop(index)
+        self._orderSelected.remove(node)
 
     def get_edit(self) -> bool:
         return self.editMode
@@ -784,62 +1056,97 @@ class CanvasGraphicsView(QGraphicsView):
 
     Path = property(get_path, set_path)
 
-    def get_raw(self) -> dict:
+    def get_raw(self, version: Optional[str] = None) -> dict:
         """
         Get the scene information. (can be be save in .pii)
+        Waits for the .pii file still loading, to never save part of it.
+
+        Parameters
+        ----------
+        version: (str)
+            Version of .pii data, by default the PM_PII_VERSION environment
+            variable, v1 if it isn't set. Older installs can only read v1.
 
         Return
         ------
         out: (dict)
             Dictionary of scene date to be save in .pii file.
         """
-        image_data = ""
-        pixmap = self._backgroundNode.pixmap()
-        # Extract Image Data
-        if not pixmap.isNull():
-            buffer = QBuffer()
-            buffer.open(QIODevice.WriteOnly)
-            pixmap.save(buffer, "PNG")
-            # Image Data
-            image_data = bytes(buffer.data().toBase64()).decode('ascii')
+        self.finish_loading()
+        if version is None:
+            version = get_PMPiiVersion() or VERSION_1
+        if version != VERSION_2:
+            nodeList = self.get_nodes_raw()
+            return {
+                PII.VERSION: VERSION_1,
+                PII.BACKGROUND: self.get_background_base64(),
+                PII.NODES: nodeList
+            }
+
+        styles = StyleTable()
+        nodeList = self.get_nodes_raw(styles)
+        image_data, image_format = self.get_background_data()
+        return {
+            PII.VERSION: VERSION_2,
+            PII.BACKGROUND: image_data,
+            PII.IMAGE_FORMAT: image_format,
+            PII.NODES: nodeList,
+            PII.STYLES: styles.raw()
+        }
 
+    def get_nodes_raw(self, styles: Optional[StyleTable] = None) -> List[dict]:
+        """
+        Get the information of all the nodes in the scene.
+
+        Parameters
+        ----------
+        styles: (StyleTable)
+            Table to collect the node styles in, nodes refer to it by index.
+            Without it, each node keeps its own size and colors.
+
+        Return
+        ------
+        out: (list)
+            List of node dictionaries to be save in .pii file.
+        """
+        self.finish_loading()
         nodeList = []
         for each in self._scene.items():
             if type(each) == PickNode:
-                textColor = each.defaultTextColor()
-                bgColor = each.Background
                 item = {
                     PIIPick.TYPE: PIINode.PICK,
                     PIIPick.TEXT: each.toPlainText(),
-                    PIIPick.SIZE: each.font().pointSize(),
                     PIIPick.POSITION: (each.pos().x(), each.pos().y()),
-                    PIIPick.COLOR: (textColor.red(), textColor.green(), textColor.blue()),
-                    PIIPick.BACKGROUND: (bgColor.red(), bgColor.green(), bgColor.blue()),
                     PIIPick.SELECTION: each.Items,
                     PIIPick.SHAPE: each.Shape
                 }
+                item.update(self.get_style_raw(each, styles))
                 nodeList.append(item)
             elif type(each) == ButtonNode:
-                textColor = each.defaultTextColor()
-                bgColor = each.Background
                 item = {
                     PIIButton.TYPE: PIINode.BUTTON,
                     PIIButton.TEXT: each.toPlainText(),
-                    PIIButton.SIZE: each.font().pointSize(),
                     PIIButton.POSITION: (each.pos().x(), each.pos().y()),
-                    PIIButton.COLOR: (textColor.red(), textColor.green(), textColor.blue()),
-                    PIIButton.BACKGROUND: (bgColor.red(), bgColor.green(), bgColor.blue()),
                     PIIButton.COMMAND: each.Command,
                     PIIButton.COMMANDTYPE: each.CommandsType
                 }
+                item.update(self.get_style_raw(each, styles))
                 nodeList.append(item)
+        return nodeList
 
-        rawData = {
-            PII.VERSION: "1.0.0",
-            PII.BACKGROUND: image_data,
-            PII.NODES: nodeList
-        }
-        return rawData
+    def get_style_raw(self, node: PickNode, styles: Optional[StyleTable] = None) -> dict:
+        """
+        Get the size and colors of the node to be saved in .pii file.
+
+        :param node: Reference to a PickNode or ButtonNode.
+        :param styles: Table to add the style to, otherwise the style is inline.
+        """
+        size = node.font().pointSize()
+        textColor = color_raw(node.defaultTextColor())
+        bgColor = color_raw(node.Background)
+        if styles is not None:
+            return {PIIPick.STYLE: styles.add(size, textColor, bgColor)}
+        return {PIIPick.SIZE: size, PIIPick.COLOR: textColor, PIIPick.BACKGROUND: bgColor}
 
     def set_raw(self, data: dict) -> None:
         """
@@ -851,8 +1158,10 @@ class CanvasGraphicsView(QGraphicsView):
             Dictionary of date from .pii file.
         """
         if data:
-            if data[PII.VERSION] == "1.0.0":
+            if data[PII.VERSION] == VERSION_1:
                 self.load_1_0_0(data)
+            elif data[PII.VERSION] == VERSION_2:
+                self.load_2_0_0(data)
 
     Raw = property(get_raw, set_raw)
 
@@ -865,16 +1174,20 @@ class CanvasGraphicsView(QGraphicsView):
         out: (list)
             List of namespaces.
         """
-        namespaceList = []
-        for each in self._scene.items():
-            if type(each) == PickNode:
-                valueList = each.Items
-                for sObj in valueList:
-                    if ":" in sObj:
-                        group = sObj.split(":")[:-1]
-                        for index in range(len(group)):
-                            namespaceList.append(":".join(group[:index + 1]))
-        return list(set(namespaceList))
+        self.finish_loading()
+        return self._namespaces.namespaces()
+
+    def get_first_namespace(self) -> Optional[str]:
+        """
+        Get the first namespace of all PickNode, in sorted order.
+
+        Return
+        ------
+        out: (str)
+            Namespace, None if the nodes don't use any.
+        """
+        self.finish_loading()
+        return self._namespaces.first()
 
     def set_namespace(self, data: dict) -> None:
         """
@@ -885,29 +1198,13 @@ class CanvasGraphicsView(QGraphicsView):
         data: (dict)
             Dictionary of namespace with value of new namespace.
         """
+        self.finish_loading()
+        remapper = NamespaceRemapper(data)
         for each in self._scene.items():
             if type(each) == PickNode:
-                valueList = each.Items
-                newValue = []
-                for sObj in valueList:
-                    if ":" in sObj:
-                        # namesapce
-                        nameS = ":".join(sObj.split(":")[:-1])
-                        # object name
-                        object_name = sObj.split(":")[-1]
-                        keys = list(data.keys())
-                        keys.sort(reverse=True)
-                        for key in keys:
-                            if key in nameS:
-                                nameS = nameS.replace(key, data[key], 1)
-                        # making sure doesn't start with ':'
-                        nameS = nameS[1:] if nameS.startswith(":") else nameS
-                        # add the object to namespace
-                        nameS = ":".join([nameS, object_name]) if nameS else object_name
-                        newValue.append(nameS)
-                    else:
-                        newValue.append(sObj)
-                each.Items = newValue
+                newValue = remapper.names(each.Items)
+                if newValue != each.Items:
+                    each.Items = newValue
 
     Namespace = property(get_namespace, set_namespace)
 
@@ -919,38 +1216,47 @@ class CanvasGraphicsView(QGraphicsView):
 
     NamespaceHistory = property(get_NSHistory, set_NSHistory)
 
-    def get_highlight(self) -> None:
-        return
+    def get_highlight(self) -> List[str]:
+        return list(self._highlightNames)
 
     def set_highlight(self, data: list) -> None:
-        if data:
-            for each in self._scene.items():
-                # QApplication.processEvents()
-                if type(each) == PickNode:
-                    for item in data:
-                        if item in each.Items:
-                            each.Highlight = True
-                            break
-                        else:
-                            each.Highlight = False
-        else:
-            for each in self._scene.items():
-                if type(each) == PickNode:
-                    each.Highlight = False
+        """
+        Highlight the PickNodes selecting any of the given Maya objects.
+        Only the nodes whose state changes since the last call are updated.
+
+        :param data: List of Maya object names.
+        """
+        self._highlightNames = frozenset(data) if data else frozenset()
+        highlighted = self._selectionIndex.nodes(self._highlightNames)
+        for each in self._highlighted - highlighted:
+            each.Highlight = False
+        for each in highlighted - self._highlighted:
+            each.Highlight = True
+        self._highlighted = highlighted
 
     Highlight = property(get_highlight, set_highlight)
 
     def clear_scene(self) -> None:
         """ Clear the scene. """
-        self._orderSelected = []
+        self._orderSelected.clear()
+        self._selected = set()
+        self.stop_loading()
+        self._selectionIndex.clear()
+        self._namespaces.clear()
+        self._highlighted = set()
         self._scene.clear()
+        self._itemBounds = {}
+        self._sceneBounds = QRectF()
+        self._boundsDirty = False
         self._backgroundNode = QGraphicsPixmapItem()
         self._scene.addItem(self._backgroundNode)
+        self.track_bounds(self._backgroundNode)
         self.reset_view()
 
     def is_changed(self) -> bool:
-        """ Check for the scene changes. """
-        if self._backgroundNode.pixmap():
+        """ Check for the scene changes, once the .pii file is loaded. """
+        self.finish_loading()
+        if not self._backgroundNode.pixmap().isNull():
             return True
         elif len(self._scene.items()) > 1:
             return True
@@ -964,31 +1270,163 @@ class CanvasGraphicsView(QGraphicsView):
         """
         if data[PII.BACKGROUND]:
             # Import Image Data
-            newPix = QPixmap()
-            newPix.loadFromData(QByteArray.fromBase64(data[PII.BACKGROUND].encode('ascii')), "PNG")
-            self._backgroundNode.setPixmap(newPix)
-
-        for each in data[PII.NODES]:
-            if each["type"] == PIINode.PICK:
-                self.create_node(
-                    text=each[PIIPick.TEXT],
-                    size=each[PIIPick.SIZE],
-                    textColor=QColor(*each[PIIPick.COLOR]),
-                    bgColor=QColor(*each[PIIPick.BACKGROUND]),
-                    position=QPointF(*each[PIIPick.POSITION]),
-                    items=each[PIIPick.SELECTION],
-                    shape=each[PIIPick.SHAPE]
-                )
-            elif each["type"] == PIINode.BUTTON:
-                self.create_button(
-                    position=QPointF(*each[PIIButton.POSITION]),
-                    text=each[PIIButton.TEXT],
-                    size=each[PIIButton.SIZE],
-                    textColor=QColor(*each[PIIButton.COLOR]),
-                    bgColor=QColor(*each[PIIButton.BACKGROUND]),
-                    cmd=each[PIIButton.COMMAND],
-                    cmdType=each[PIIButton.COMMANDTYPE]
-                )
+            image = data.get(PII.IMAGE)
+            if image is None:
+                self.set_background_data(bytes(QByteArray.fromBase64(data[PII.BACKGROUND].encode('ascii'))), "png")
+            else:
+                # the PNG data is only decoded from base64 when it's needed
+                self.set_background_data(b"", "png", image)
+            self._model['backgroundBase64'] = data[PII.BACKGROUND]
+        self.load_nodes(data[PII.NODES])
+
+    def load_2_0_0(self, data: dict) -> None:
+        """
+        Load v2.0.0 of .pii version file.
+
+        :param data: Dictionary of date from .pii file, with the raw background image.
+        """
+        if data[PII.BACKGROUND]:
+            self.set_background_data(data[PII.BACKGROUND], data.get(PII.IMAGE_FORMAT) or "png", data.get(PII.IMAGE))
+        self.load_nodes(data[PII.NODES], styles=StyleTable(data.get(PII.STYLES)))
+
+    def load_nodes(self, nodes: List[dict], progressive: bool = True, styles: Optional[StyleTable] = None) -> None:
+        """
+        Create the nodes from .pii node dictionaries.
+
+        :param nodes: List of node dictionaries.
+        :param progressive: Build the nodes in time slices on the event loop,
+                            otherwise build them all before returning.
+        :param styles: Style table of the nodes refering to a style by index.
+        """
+        self._pendingNodes.extend((each, styles) for each in nodes)
+        self._loadTotal += len(nodes)
+        if progressive:
+            self._loadTimer.start()
+        else:
+            self.finish_loading()
+
+    def load_async(self, future: Future) -> None:
+        """
+        Load the .pii data of a future once it is done, see set_decoded.
+
+        :param future: Future of the .pii data decoded on a worker thread.
+        """
+        self._decoding = future
+
+    def set_decoded(self, future: Future) -> None:
+        """
+        Load the .pii data of the future given to load_async, waiting for it
+        if needed. A file which couldn't be decoded loads nothing.
+
+        :param future: Future of the .pii data decoded on a worker thread.
+        """
+        if future is not self._decoding:
+            return
+        self._decoding = None
+        if future.exception() is None:
+            self.set_raw(future.result())
+        if not self._loadTimer.isActive():
+            self._loaded()
+
+    def load_batch(self) -> None:
+        """
+        Build the pending nodes for one time slice.
+        """
+        deadline = time.perf_counter() + LOAD_TIME_SLICE
+        while self._pendingNodes and time.perf_counter() < deadline:
+            self.create_from_raw(*self._pendingNodes.popleft())
+        self.onLoadProgress.emit(self._loadTotal - len(self._pendingNodes), self._loadTotal)
+        if not self._pendingNodes:
+            self._loaded()
+
+    def finish_loading(self) -> None:
+        """
+        Build all the pending nodes right away, waiting for the file given to
+        load_async to be decoded.
+        """
+        if self._decoding is not None:
+            self.set_decoded(self._decoding)
+        if self._pendingNodes or self._loadTimer.isActive():
+            while self._pendingNodes:
+                self.create_from_raw(*self._pendingNodes.popleft())
+            self.onLoadProgress.emit(self._loadTotal, self._loadTotal)
+            self._loaded()
+
+    def stop_loading(self) -> None:
+        """
+        Drop the file being decoded and the nodes waiting to be built.
+        """
+        self._decoding = None
+        self._pendingNodes.clear()
+        self._loadTotal = 0
+        self._loadCallbacks = []
+        self._loadTimer.stop()
+
+    def _loaded(self) -> None:
+        self._loadTimer.stop()
+        self._loadTotal = 0
+        callbacks = self._loadCallbacks
+        self._loadCallbacks = []
+        self.onLoadFinished.emit()
+        for func in callbacks:
+            func()
+
+    def is_loading(self) -> bool:
+        """
+        Check if the .pii file is still decoding or nodes are waiting to be built.
+
+        Return
+        ------
+        out: (bool)
+            True while the .pii nodes are being loaded, otherwise False.
+        """
+        return self._decoding is not None or self._loadTimer.isActive() or bool(self._pendingNodes)
+
+    def call_when_loaded(self, func: Callable[[], None]) -> None:
+        """
+        Call the function once all the nodes are built.
+
+        :param func: Function to call, called right away if nothing is loading.
+        """
+        if self.is_loading():
+            self._loadCallbacks.append(func)
+        else:
+            func()
+
+    def create_from_raw(self, each: dict, styles: Optional[StyleTable] = None) -> None:
+        """
+        Create a node from .pii node dictionary.
+
+        :param each: Node dictionary.
+        :param styles: Style table of the file, for nodes refering to a style by index.
+        """
+        if PIIPick.STYLE in each:
+            font, textColor, bgColor = styles.get(each[PIIPick.STYLE])
+            size = font.pointSize()
+        else:
+            size = each[PIIPick.SIZE]
+            textColor = get_color(each[PIIPick.COLOR])
+            bgColor = get_color(each[PIIPick.BACKGROUND])
+        if each["type"] == PIINode.PICK:
+            self.create_node(
+                text=each[PIIPick.TEXT],
+                size=size,
+                textColor=textColor,
+                bgColor=bgColor,
+                position=QPointF(*each[PIIPick.POSITION]),
+                items=each[PIIPick.SELECTION],
+                shape=each[PIIPick.SHAPE]
+            )
+        elif each["type"] == PIINode.BUTTON:
+            self.create_button(
+                position=QPointF(*each[PIIButton.POSITION]),
+                text=each[PIIButton.TEXT],
+                size=size,
+                textColor=textColor,
+                bgColor=bgColor,
+                cmd=each[PIIButton.COMMAND],
+                cmdType=each[PIIButton.COMMANDTYPE]
+            )
 
     def set_nodes_bg_color(self, colour: QColor) -> None:
         """
@@ -1019,9 +1457,7 @@ class CanvasGraphicsView(QGraphicsView):
         """
         self._defaultTextSize = size
         for each in self._scene.selectedItems():
-            font = each.font()
-            font.setPointSize(size)
-            each.setFont(font)
+            each.setFont(get_font(size))
 
     def set_nodes_text(self, text: str) -> None:
         """